@@ -9,7 +9,7 @@ import subprocess
 import sys
 import tempfile
 import uuid
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 import click
 
@@ -276,26 +276,20 @@ def run_command(
         sys.exit(1)
 
 
-@cli.command("explain")
-@click.option(
-    "--run", "run_dir", required=True,
-    type=click.Path(exists=True, file_okay=False, readable=True),
-    help="Path to a run directory containing RunIndex.json",
-)
-def explain_command(run_dir: str) -> None:
-    """Print stage inputs and outputs recorded in RunIndex.json."""
+def run_explain(run_dir: Path) -> int:
+    """Print stage inputs and outputs recorded in RunIndex.json; return the exit code."""
     run_path = Path(run_dir)
     index_path = run_path / "RunIndex.json"
 
     if not index_path.exists():
         click.echo(f"Error: RunIndex.json not found in {run_path}", err=True)
-        sys.exit(1)
+        return 1
 
     try:
         run_index = json.loads(index_path.read_text(encoding="utf-8"))
     except json.JSONDecodeError as exc:
         click.echo(f"Error: RunIndex.json is not valid JSON: {exc}", err=True)
-        sys.exit(1)
+        return 1
 
     for stage in run_index["stages"]:
         click.echo(f"Stage: {stage['name']}")
@@ -305,22 +299,33 @@ def explain_command(run_dir: str) -> None:
         click.echo("  outputs:")
         for out in stage["outputs"]:
             click.echo(f"    {out['path']} {out['sha256']}")
+    return 0
 
 
-@cli.command("replay")
+@cli.command("explain")
 @click.option(
     "--run", "run_dir", required=True,
     type=click.Path(exists=True, file_okay=False, readable=True),
     help="Path to a run directory containing RunIndex.json",
 )
-def replay_command(run_dir: str) -> None:
-    """Verify hashes and re-run only stages with missing or corrupt outputs."""
+def explain_command(run_dir: str) -> None:
+    """Print stage inputs and outputs recorded in RunIndex.json."""
+    code = run_explain(Path(run_dir))
+    if code:
+        sys.exit(code)
+
+
+def run_replay(run_dir: Path) -> int:
+    """Verify hashes and re-run only stages with missing or corrupt outputs.
+
+    Returns the exit code (0 on a completed replay, 1 otherwise).
+    """
     run_path = Path(run_dir)
     index_path = run_path / "RunIndex.json"
 
     if not index_path.exists():
         click.echo(f"Error: RunIndex.json not found in {run_path}", err=True)
-        sys.exit(1)
+        return 1
 
     run_index = json.loads(index_path.read_text(encoding="utf-8"))
 
@@ -344,7 +349,7 @@ def replay_command(run_dir: str) -> None:
     summary_path = run_path / "run_summary.json"
     if not summary_path.exists():
         click.echo("Error: run_summary.json not found; cannot replay.", err=True)
-        sys.exit(1)
+        return 1
 
     run_summary = json.loads(summary_path.read_text(encoding="utf-8"))
     project_path = run_summary.get("project_path", "")
@@ -352,7 +357,7 @@ def replay_command(run_dir: str) -> None:
         click.echo(
             f"Error: project_path {project_path!r} does not exist.", err=True
         )
-        sys.exit(1)
+        return 1
 
     project_config = json.loads(Path(project_path).read_text(encoding="utf-8"))
     # run_dir layout: <artifacts_dir>/<project_id>/<run_id>/
@@ -374,11 +379,24 @@ def replay_command(run_dir: str) -> None:
 
     if new_summary["status"] == "completed":
         click.echo("Replay completed successfully.")
-    else:
-        click.echo("Replay FAILED.", err=True)
-        for err in new_summary.get("errors", []):
-            click.echo(f"  Error: {err}", err=True)
-        sys.exit(1)
+        return 0
+    click.echo("Replay FAILED.", err=True)
+    for err in new_summary.get("errors", []):
+        click.echo(f"  Error: {err}", err=True)
+    return 1
+
+
+@cli.command("replay")
+@click.option(
+    "--run", "run_dir", required=True,
+    type=click.Path(exists=True, file_okay=False, readable=True),
+    help="Path to a run directory containing RunIndex.json",
+)
+def replay_command(run_dir: str) -> None:
+    """Verify hashes and re-run only stages with missing or corrupt outputs."""
+    code = run_replay(Path(run_dir))
+    if code:
+        sys.exit(code)
 
 
 @cli.command("write")
@@ -666,22 +684,20 @@ def _compare_contract_artifacts(dir_a: Path, dir_b: Path) -> list[dict]:
     return sorted(diffs, key=lambda d: (d["artifact"], d["path"]))
 
 
-@cli.command("validate-run")
-@click.option("--run", "run_dir", required=True,
-              type=click.Path(exists=True, file_okay=False, readable=True),
-              help="Path to a run directory containing RunIndex.json")
-def validate_run_command(run_dir: str) -> None:
-    """Re-hash artifacts and validate schema metadata in a run directory."""
+def validate_run_errors(run_dir: Path) -> list[str]:
+    """Re-hash artifacts and check schema metadata / CanonDecision consistency.
+
+    Returns the validate-run error lines for *run_dir* in output order; an
+    empty list means the run is valid.
+    """
     run_path = Path(run_dir)
     index_path = run_path / "RunIndex.json"
     if not index_path.exists():
-        click.echo(f"ERROR: RunIndex.json not found in {run_path}")
-        sys.exit(1)
+        return [f"ERROR: RunIndex.json not found in {run_path}"]
     try:
         run_index = json.loads(index_path.read_text(encoding="utf-8"))
     except json.JSONDecodeError as exc:
-        click.echo(f"ERROR: RunIndex.json is not valid JSON: {exc}")
-        sys.exit(1)
+        return [f"ERROR: RunIndex.json is not valid JSON: {exc}"]
 
     errors: list[str] = []
 
@@ -738,6 +754,16 @@ def validate_run_command(run_dir: str) -> None:
                 f"but decision={decision!r}"
             )
 
+    return errors
+
+
+@cli.command("validate-run")
+@click.option("--run", "run_dir", required=True,
+              type=click.Path(exists=True, file_okay=False, readable=True),
+              help="Path to a run directory containing RunIndex.json")
+def validate_run_command(run_dir: str) -> None:
+    """Re-hash artifacts and validate schema metadata in a run directory."""
+    errors = validate_run_errors(Path(run_dir))
     if errors:
         for err in errors:
             click.echo(err)
@@ -769,6 +795,16 @@ def diff_command(run_dir: str, against_dir: str) -> None:
         click.echo("OK: no differences")
 
 
+def _guarded_run_check(check, *run_dirs: Path) -> list[str]:
+    """Run an in-process run-dir *check*; a malformed run dir becomes an ERROR line."""
+    try:
+        return check(*run_dirs)
+    except KeyError as exc:
+        return [f"ERROR: RunIndex entry missing key {exc}"]
+    except (OSError, ValueError, AttributeError, TypeError) as exc:
+        return [f"ERROR: {exc}"]
+
+
 @cli.command("verify-system")
 def verify_system_command() -> None:
     """Run external tool checks then full pipeline + validate + diff."""
@@ -841,24 +877,19 @@ def verify_system_command() -> None:
         if not pipeline_ok:
             errors.append(("orchestrator run", proc.stdout + proc.stderr))
 
+        # Steps 5–6 only read run_dir, so they run in-process rather than
+        # paying another interpreter start-up each; step 4 above still goes
+        # through the installed entry point.
         if pipeline_ok:
             # Step 5: validate-run
-            proc = subprocess.run(
-                [orchestrator_bin, "validate-run", "--run", str(run_dir)],
-                capture_output=True, text=True,
-            )
-            if proc.returncode != 0:
-                errors.append(("orchestrator validate-run",
-                                proc.stdout + proc.stderr))
+            validate_errors = _guarded_run_check(validate_run_errors, run_dir)
+            if validate_errors:
+                errors.append(("orchestrator validate-run", "\n".join(validate_errors)))
 
             # Step 6: diff against itself
-            proc = subprocess.run(
-                [orchestrator_bin, "diff",
-                 "--run", str(run_dir), "--against", str(run_dir)],
-                capture_output=True, text=True,
-            )
-            if proc.returncode != 0:
-                errors.append(("orchestrator diff", proc.stdout + proc.stderr))
+            diff_lines = _guarded_run_check(_diff_run_dirs, run_dir, run_dir)
+            if diff_lines:
+                errors.append(("orchestrator diff", "\n".join(diff_lines)))
 
     if errors:
         for step_name, output in errors:
@@ -897,36 +928,61 @@ def package_command(run_dir: str, episode_id: str, out_dir: str, mode: str) -> N
     click.echo(f"OK: packaged episode {episode_id}")
 
 
-@cli.command("validate-bundle")
-@click.option(
-    "--bundle", "bundle_dir", required=True,
-    type=click.Path(exists=True, file_okay=False, readable=True),
-    help="Path to a bundle root directory containing EpisodeBundle.json",
-)
-def validate_bundle_command(bundle_dir: str) -> None:
-    """Re-verify all artifact hashes and bundle_hash in an EpisodeBundle."""
+def _bundle_key(rel_path: str) -> str:
+    """Normalised form of a bundle-relative POSIX path (drops ``./`` and doubled ``/``)."""
+    return PurePosixPath(rel_path).as_posix()
+
+
+def _scan_bundle_files(bundle_path: Path, rel_paths) -> dict[str, os.DirEntry]:
+    """Map each bundle-relative file path under *bundle_path* to its DirEntry.
+
+    Keys are normalised with _bundle_key, so equivalent spellings such as
+    ``./media/x.png`` and ``media//x.png`` resolve to the same entry.
+    Each distinct parent directory of *rel_paths* is listed once with
+    os.scandir, and is_file() comes from the directory listing itself.
+    Unreadable directories are skipped.
+    """
+    on_disk: dict[str, os.DirEntry] = {}
+    for parent in sorted({PurePosixPath(rel).parent.as_posix() for rel in rel_paths}):
+        prefix = "" if parent == "." else f"{parent}/"
+        try:
+            with os.scandir(bundle_path / parent) as it:
+                for de in it:
+                    if de.is_file():
+                        on_disk[prefix + de.name] = de
+        except OSError:
+            continue
+    return on_disk
+
+
+def validate_bundle_errors(bundle_dir: Path) -> list[str]:
+    """Re-verify all artifact hashes and bundle_hash in an EpisodeBundle.
+
+    Returns the validate-bundle error lines for *bundle_dir*; an empty list
+    means the bundle is valid.
+    """
     bundle_path = Path(bundle_dir)
     bundle_json_path = bundle_path / "EpisodeBundle.json"
 
     if not bundle_json_path.exists():
-        click.echo(f"ERROR: EpisodeBundle.json not found in {bundle_path}")
-        sys.exit(1)
+        return [f"ERROR: EpisodeBundle.json not found in {bundle_path}"]
 
     try:
         bundle_data = json.loads(bundle_json_path.read_text(encoding="utf-8"))
     except json.JSONDecodeError as exc:
-        click.echo(f"ERROR: EpisodeBundle.json is not valid JSON: {exc}")
-        sys.exit(1)
+        return [f"ERROR: EpisodeBundle.json is not valid JSON: {exc}"]
 
     errors: list[str] = []
 
     # Verify each artifact file hash
-    for name, entry in bundle_data.get("artifacts", {}).items():
-        fp = bundle_path / entry["path"]
-        if not fp.exists():
+    artifacts = bundle_data.get("artifacts", {})
+    on_disk = _scan_bundle_files(bundle_path, [e["path"] for e in artifacts.values()])
+    for name, entry in artifacts.items():
+        de = on_disk.get(_bundle_key(entry["path"]))
+        if de is None:
             errors.append(f"ERROR: missing file: {entry['path']}")
             continue
-        if hash_file_bytes(fp) != entry["sha256"]:
+        if hash_file_bytes(de.path) != entry["sha256"]:
             errors.append(f"ERROR: hash mismatch for {entry['path']}")
 
     # Verify bundle_hash
@@ -935,6 +991,18 @@ def validate_bundle_command(bundle_dir: str) -> None:
     if hash_artifact(without) != bundle_data.get("bundle_hash", ""):
         errors.append("ERROR: bundle_hash mismatch")
 
+    return errors
+
+
+@cli.command("validate-bundle")
+@click.option(
+    "--bundle", "bundle_dir", required=True,
+    type=click.Path(exists=True, file_okay=False, readable=True),
+    help="Path to a bundle root directory containing EpisodeBundle.json",
+)
+def validate_bundle_command(bundle_dir: str) -> None:
+    """Re-verify all artifact hashes and bundle_hash in an EpisodeBundle."""
+    errors = validate_bundle_errors(Path(bundle_dir))
     if errors:
         for e in errors:
             click.echo(e)
@@ -6,7 +6,7 @@ import shutil
 import urllib.parse
 from pathlib import Path
 
-from .utils.hashing import hash_artifact, hash_file_bytes
+from .utils.hashing import canonical_json_bytes, hash_artifact, hash_file_bytes
 
 # ---------------------------------------------------------------------------
 # Artifact configuration
@@ -214,9 +214,9 @@ def package_episode(
     bundle["bundle_hash"] = hash_artifact(
         {k: v for k, v in bundle.items() if k != "created_utc"}
     )
-    (bundle_root / "EpisodeBundle.json").write_text(
-        json.dumps(bundle, indent=2), encoding="utf-8"
-    )
+    # Written in the contracts' canonical form (sorted, compact, trailing
+    # newline) — the same layout as contracts/goldens/minimal/EpisodeBundle.json.
+    (bundle_root / "EpisodeBundle.json").write_bytes(canonical_json_bytes(bundle) + b"\n")
 
     return bundle_root
 
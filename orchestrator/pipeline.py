@@ -1,5 +1,6 @@
 """PipelineRunner: executes the 5-stage orchestrator pipeline with resume/skip/force logic."""
 
+import functools
 import hashlib
 import importlib
 import json
@@ -9,7 +10,8 @@ from pathlib import Path
 from typing import Optional
 
 from .registry import ArtifactRegistry
-from .utils.hashing import hash_artifact, hash_file_bytes
+from .utils.fileio import atomic_write_bytes
+from .utils.hashing import canonical_json_bytes, hash_file_bytes
 
 # Ordered list of (stage_number, module_name, artifact_type)
 STAGES: list[tuple[int, str, str]] = [
@@ -21,6 +23,8 @@ STAGES: list[tuple[int, str, str]] = [
 ]
 
 # Maps stage_name → artifact types that stage reads from the registry.
+# Every stage reads its predecessor's output, so the dependency graph is a
+# straight chain and stages must run serially (no two can overlap).
 STAGE_INPUTS: dict[str, list[str]] = {
     "stage1_generate_script":           [],
     "stage2_script_to_shotlist":        ["Script"],
@@ -45,22 +49,30 @@ class _ContinuationRejected(RuntimeError):
 _GATE_EXCEPTIONS = (_SchemaMissingError, _ContinuationMissing, _ContinuationRejected)
 
 
+@functools.lru_cache(maxsize=256)
+def _run_id_for(content: bytes) -> str:
+    return "run-" + hashlib.sha256(content).hexdigest()[:12]
+
+
 def compute_run_id(project_config: dict) -> str:
     """Derive a stable run ID from the canonical SHA-256 of the project config.
 
     Returns a string of the form "run-<12 hex chars>".
-    The same project config always maps to the same run ID.
+    The same project config always maps to the same run ID.  The digest is
+    cached on the canonical bytes, so a mutated config can never hit a stale
+    entry.
     """
-    content = json.dumps(
-        project_config, sort_keys=True, separators=(",", ":")
-    ).encode("utf-8")
-    return "run-" + hashlib.sha256(content).hexdigest()[:12]
+    return _run_id_for(canonical_json_bytes(project_config))
+
 
+def _build_file_entry(run_dir: Path, file_path: Path, sha256: str | None = None) -> dict:
+    """Build a RunIndex file entry with sha256 + optional schema metadata.
 
-def _build_file_entry(run_dir: Path, file_path: Path) -> dict:
-    """Build a RunIndex file entry with sha256 + optional schema metadata."""
+    *sha256* may be supplied when the byte digest is already known (e.g. from
+    ArtifactRegistry.get_file_sha256); otherwise the file is hashed.
+    """
     rel_path = str(file_path.relative_to(run_dir))
-    entry: dict = {"path": rel_path, "sha256": hash_file_bytes(file_path)}
+    entry: dict = {"path": rel_path, "sha256": sha256 or hash_file_bytes(file_path)}
     try:
         data = json.loads(file_path.read_text(encoding="utf-8"))
     except (json.JSONDecodeError, OSError):
@@ -131,6 +143,7 @@ def write_run_index(
     stage_results: list[dict],
     *,
     failure_reason: str | None = None,
+    registry: ArtifactRegistry | None = None,
 ) -> dict:
     """Compute and write RunIndex.json into run_dir after a completed (or denied) run.
 
@@ -139,8 +152,21 @@ def write_run_index(
     - RunIndex run_id = SHA-256 over sorted set of unique input-file hashes.
     - Called only when overall pipeline status == "completed" OR when CanonGate denied.
     - failure_reason: if set, adds status="failed" and failure_reason to RunIndex.
+    - registry: if given, byte digests recorded at write time are reused for
+      files it wrote and has not seen change since.
+
+    Each file is hashed and parsed at most once, even when it appears as the
+    output of one stage and the input of others.
     """
     stages_index: list[dict] = []
+    entries: dict[Path, dict] = {}
+
+    def _entry(file_path: Path) -> dict:
+        entry = entries.get(file_path)
+        if entry is None:
+            sha256 = registry.get_file_sha256(file_path) if registry is not None else None
+            entry = entries[file_path] = _build_file_entry(run_dir, file_path, sha256)
+        return dict(entry)
 
     for result in stage_results:
         stage_name = result["name"]
@@ -150,20 +176,20 @@ def write_run_index(
         artifact_file = run_dir / f"{artifact_type}.json"
         outputs = []
         if artifact_file.exists():
-            outputs.append(_build_file_entry(run_dir, artifact_file))
+            outputs.append(_entry(artifact_file))
 
         # CanonDecision: append to stage1_generate_script outputs if present
         if stage_name == "stage1_generate_script":
             canon_file = run_dir / "CanonDecision.json"
             if canon_file.exists():
-                outputs.append(_build_file_entry(run_dir, canon_file))
+                outputs.append(_entry(canon_file))
 
         # inputs — sorted for determinism within each stage
         inputs = []
         for itype in sorted(STAGE_INPUTS.get(stage_name, [])):
             ifile = run_dir / f"{itype}.json"
             if ifile.exists():
-                inputs.append(_build_file_entry(run_dir, ifile))
+                inputs.append(_entry(ifile))
 
         stages_index.append({"name": stage_name, "inputs": inputs, "outputs": outputs})
 
@@ -186,9 +212,9 @@ def write_run_index(
     if failure_reason is not None:
         run_index["status"] = "failed"
         run_index["failure_reason"] = failure_reason
-    (run_dir / "RunIndex.json").write_text(
-        json.dumps(run_index, indent=2), encoding="utf-8"
-    )
+    # The dict is returned to the caller, so it is built in full either way;
+    # write it in one atomic step so explain/replay never see a partial index.
+    atomic_write_bytes(run_dir / "RunIndex.json", json.dumps(run_index, indent=2).encode("utf-8"))
     return run_index
 
 
@@ -245,8 +271,15 @@ class PipelineRunner:
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _should_run(self, stage_num: int, artifact_type: str) -> bool:
-        """Return True if the stage should execute (not be skipped)."""
+    def _should_run(
+        self, stage_num: int, artifact_type: str, snapshot: frozenset[str] | None = None
+    ) -> bool:
+        """Return True if the stage should execute (not be skipped).
+
+        *snapshot* is the run directory listing taken before the stage loop.
+        Stages only write their own artifact types, so a name missing from it
+        can only mean the stage has not produced its artifact yet.
+        """
         if stage_num < self.from_stage:
             return False
         # When a specific starting stage is given without --to-last-stage,
@@ -257,9 +290,35 @@ class PipelineRunner:
         if self.force:
             return True
         return not self.registry.exists_and_valid(
-            self.project_id, self.run_id, artifact_type
+            self.project_id, self.run_id, artifact_type, snapshot=snapshot
         )
 
+    def _stage_result(
+        self,
+        stage_num: int,
+        stage_name: str,
+        artifact_type: str,
+        status: str,
+        *,
+        duration_sec: float = 0.0,
+        artifact_hash: str | None = None,
+        error: str | None = None,
+    ) -> dict:
+        """Build one ``summary["stages"]`` entry (plain dict: it is JSON-serialised)."""
+        return {
+            "name": stage_name,
+            "stage_num": stage_num,
+            "artifact_type": artifact_type,
+            "status": status,
+            "skipped": status == "skipped",
+            "duration_sec": duration_sec,
+            "artifact_path": str(
+                self.registry.artifact_path(self.project_id, self.run_id, artifact_type)
+            ),
+            "artifact_hash": artifact_hash,
+            "error": error,
+        }
+
     # ------------------------------------------------------------------
     # Public entry point
     # ------------------------------------------------------------------
@@ -269,7 +328,8 @@ class PipelineRunner:
 
         Writes run_summary.json regardless of success or failure.
         If any stage raises an exception, the pipeline stops at that stage
-        and the summary status is set to "failed".
+        and the summary status is set to "failed".  When RunIndex.json is
+        written, the returned summary also holds it under "run_index".
         """
         started_at = datetime.now(timezone.utc).isoformat()
         stage_results: list[dict] = []
@@ -277,27 +337,16 @@ class PipelineRunner:
         overall_status = "completed"
         run_dir = self.registry.run_dir(self.project_id, self.run_id)
         _failure_reason: str | None = None
+        snapshot = (
+            None if self.force else self.registry.snapshot_run(self.project_id, self.run_id)
+        )
 
         for stage_num, stage_name, artifact_type in STAGES:
-            should_run = self._should_run(stage_num, artifact_type)
+            should_run = self._should_run(stage_num, artifact_type, snapshot)
 
             if not should_run:
                 stage_results.append(
-                    {
-                        "name": stage_name,
-                        "stage_num": stage_num,
-                        "artifact_type": artifact_type,
-                        "status": "skipped",
-                        "skipped": True,
-                        "duration_sec": 0.0,
-                        "artifact_path": str(
-                            self.registry.artifact_path(
-                                self.project_id, self.run_id, artifact_type
-                            )
-                        ),
-                        "artifact_hash": None,
-                        "error": None,
-                    }
+                    self._stage_result(stage_num, stage_name, artifact_type, "skipped")
                 )
                 continue
 
@@ -372,21 +421,9 @@ class PipelineRunner:
                     if isinstance(exc, _ContinuationRejected):
                         _failure_reason = "continuation_rejected"
                     stage_results.append(
-                        {
-                            "name": stage_name,
-                            "stage_num": stage_num,
-                            "artifact_type": artifact_type,
-                            "status": "failed",
-                            "skipped": False,
-                            "duration_sec": 0.0,
-                            "artifact_path": str(
-                                self.registry.artifact_path(
-                                    self.project_id, self.run_id, artifact_type
-                                )
-                            ),
-                            "artifact_hash": None,
-                            "error": msg,
-                        }
+                        self._stage_result(
+                            stage_num, stage_name, artifact_type, "failed", error=msg
+                        )
                     )
                     break
 
@@ -412,21 +449,11 @@ class PipelineRunner:
 
                 duration = time.monotonic() - stage_start
                 stage_results.append(
-                    {
-                        "name": stage_name,
-                        "stage_num": stage_num,
-                        "artifact_type": artifact_type,
-                        "status": "completed",
-                        "skipped": False,
-                        "duration_sec": round(duration, 6),
-                        "artifact_path": str(
-                            self.registry.artifact_path(
-                                self.project_id, self.run_id, artifact_type
-                            )
-                        ),
-                        "artifact_hash": hash_artifact(artifact),
-                        "error": None,
-                    }
+                    self._stage_result(
+                        stage_num, stage_name, artifact_type, "completed",
+                        duration_sec=round(duration, 6),
+                        artifact_hash=self.registry.artifact_hash(artifact),
+                    )
                 )
             except Exception as exc:
                 duration = time.monotonic() - stage_start
@@ -438,21 +465,11 @@ class PipelineRunner:
                 errors.append(error_msg)
                 overall_status = "failed"
                 stage_results.append(
-                    {
-                        "name": stage_name,
-                        "stage_num": stage_num,
-                        "artifact_type": artifact_type,
-                        "status": "failed",
-                        "skipped": False,
-                        "duration_sec": round(duration, 6),
-                        "artifact_path": str(
-                            self.registry.artifact_path(
-                                self.project_id, self.run_id, artifact_type
-                            )
-                        ),
-                        "artifact_hash": None,
-                        "error": error_msg,
-                    }
+                    self._stage_result(
+                        stage_num, stage_name, artifact_type, "failed",
+                        duration_sec=round(duration, 6),
+                        error=error_msg,
+                    )
                 )
                 break  # stop on first failure
 
@@ -470,9 +487,12 @@ class PipelineRunner:
         self.registry.write_run_summary(self.project_id, self.run_id, summary)
 
         # Write RunIndex.json on completion or continuation_rejected only.
+        # The returned summary (not run_summary.json) carries the index dict.
         if overall_status == "completed":
-            write_run_index(run_dir, stage_results)
+            summary["run_index"] = write_run_index(run_dir, stage_results, registry=self.registry)
         elif _failure_reason is not None:         # CanonGate denied only
-            write_run_index(run_dir, stage_results, failure_reason=_failure_reason)
+            summary["run_index"] = write_run_index(
+                run_dir, stage_results, failure_reason=_failure_reason, registry=self.registry
+            )
 
         return summary
@@ -4,11 +4,14 @@ EpisodeRegistry: flat variant that maps all paths to a single episode directory,
 used by the ``--draft`` CLI mode (no project.json / no run_id nesting).
 """
 
+import hashlib
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from .utils.fileio import atomic_write_bytes
 from .utils.hashing import hash_artifact
 from .validator import validate_artifact
 
@@ -23,12 +26,19 @@ _ARTIFACT_ID_FIELD: dict[str, str] = {
     "RenderPackage": "request_id",
 }
 
+# Artifact file layout: indented, sorted keys.
+_ARTIFACT_ENCODER = json.JSONEncoder(indent=2, sort_keys=True)
+
 
 class ArtifactRegistry:
     """Manages artifact storage under base_dir/<project_id>/<run_id>/."""
 
     def __init__(self, base_dir: str | Path) -> None:
         self.base_dir = Path(base_dir)
+        # artifact path → (artifact stamp, sha256 of the bytes written).
+        self._file_sha256: dict[Path, tuple[tuple, str]] = {}
+        # hash_artifact cache for the dicts written through this registry.
+        self._artifact_hashes: dict[int, tuple[dict, str]] = {}
 
     # ------------------------------------------------------------------
     # Path helpers
@@ -49,11 +59,38 @@ class ArtifactRegistry:
     # Existence / validity check
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _stamp(path: Path) -> tuple | None:
+        """Return (mtime_ns, size, inode) for *path*, or None if it cannot be stat'd."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def snapshot_run(self, project_id: str, run_id: str) -> frozenset[str]:
+        """Return the names of all entries in the run directory (one scandir).
+
+        An absent run directory yields an empty set.
+        """
+        try:
+            with os.scandir(self.run_dir(project_id, run_id)) as it:
+                return frozenset(entry.name for entry in it)
+        except OSError:
+            return frozenset()
+
     def exists_and_valid(
-        self, project_id: str, run_id: str, artifact_type: str
+        self,
+        project_id: str,
+        run_id: str,
+        artifact_type: str,
+        snapshot: frozenset[str] | None = None,
     ) -> bool:
         """Return True iff the artifact file exists AND passes schema validation.
 
+        *snapshot* (from snapshot_run) lets absent artifacts be rejected without
+        a stat call; names present in it are still checked on disk.
+
         Meta is treated as strictly optional: only fail on a *confirmed* hash
         mismatch (meta parsed successfully AND ``"hash"`` key present AND value
         differs from the current artifact content).  Any other meta problem
@@ -61,12 +98,12 @@ class ArtifactRegistry:
         if no meta file exists, and the artifact is still considered valid.
         """
         path = self.artifact_path(project_id, run_id, artifact_type)
-        if not path.exists():
+        if snapshot is not None and path.name not in snapshot:
             return False
+        meta_p = self.meta_path(project_id, run_id, artifact_type)
         try:
             data = json.loads(path.read_text(encoding="utf-8"))
             validate_artifact(data, artifact_type)
-            meta_p = self.meta_path(project_id, run_id, artifact_type)
             if meta_p.exists():
                 try:
                     meta = json.loads(meta_p.read_text(encoding="utf-8"))
@@ -101,9 +138,9 @@ class ArtifactRegistry:
 
         artifact_file = self.artifact_path(project_id, run_id, artifact_type)
         artifact_file.parent.mkdir(parents=True, exist_ok=True)
-        artifact_file.write_text(
-            json.dumps(data, indent=2, sort_keys=True), encoding="utf-8"
-        )
+        content = _ARTIFACT_ENCODER.encode(data).encode("utf-8")
+        atomic_write_bytes(artifact_file, content)
+        file_sha256 = hashlib.sha256(content).hexdigest()
 
         id_field = _ARTIFACT_ID_FIELD.get(artifact_type, "id")
         artifact_id = data.get(id_field, "")
@@ -112,14 +149,37 @@ class ArtifactRegistry:
             "artifact_type": artifact_type,
             "artifact_id": artifact_id,
             "schema_version": data.get("schema_version", "1.0.0"),
-            "hash": hash_artifact(data),
+            "hash": self.artifact_hash(data),
             "parent_refs": parent_refs if parent_refs is not None else [],
             "creation_params": creation_params if creation_params is not None else {},
             "compute_origin": "local",
             "created_at": datetime.now(timezone.utc).isoformat(),
         }
         meta_file = self.meta_path(project_id, run_id, artifact_type)
-        meta_file.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        atomic_write_bytes(meta_file, json.dumps(meta, indent=2).encode("utf-8"))
+        stamp = self._stamp(artifact_file)
+        if stamp is not None:
+            self._file_sha256[artifact_file] = (stamp, file_sha256)
+
+    def artifact_hash(self, data: dict) -> str:
+        """Return hash_artifact(*data*), reusing the digest from write_artifact.
+
+        Stages hand back the dict they wrote, so the pipeline's stage summary
+        costs a lookup.  A dict passed to write_artifact must not be mutated
+        afterwards.
+        """
+        return hash_artifact(data, self._artifact_hashes)
+
+    def get_file_sha256(self, path: Path) -> str | None:
+        """Return the byte-level SHA-256 recorded when *path* was written.
+
+        Returns None unless this registry wrote *path* and the file's stat
+        stamp is unchanged since, so callers fall back to hash_file_bytes().
+        """
+        cached = self._file_sha256.get(Path(path))
+        if cached is None or cached[0] != self._stamp(Path(path)):
+            return None
+        return cached[1]
 
     # ------------------------------------------------------------------
     # Read
@@ -170,9 +230,9 @@ class EpisodeRegistry(ArtifactRegistry):
     """
 
     def __init__(self, episode_dir: Path) -> None:
-        self._episode_dir = Path(episode_dir)
         # base_dir satisfies the parent class attribute; not used for path resolution.
-        self.base_dir = self._episode_dir
+        super().__init__(episode_dir)
+        self._episode_dir = Path(episode_dir)
 
     def run_dir(self, project_id: str, run_id: str) -> Path:  # noqa: ARG002
         return self._episode_dir
@@ -57,10 +57,11 @@ def run(project_config: dict, run_id: str, registry: ArtifactRegistry) -> dict:
         speaker_id = intent.get("vo_speaker_id")
         vo_text = intent.get("vo_text")
         if speaker_id and vo_text:
+            speaker_slug = _to_slug(speaker_id)
             vo_items.append(
                 {
-                    "item_id": f"vo-{_to_slug(scene_id)}-{_to_slug(speaker_id)}-{len(vo_items):03d}",
-                    "speaker_id": _to_slug(speaker_id),
+                    "item_id": f"vo-{_to_slug(scene_id)}-{speaker_slug}-{len(vo_items):03d}",
+                    "speaker_id": speaker_slug,
                     "text": vo_text,
                     "license_type": "generated_local",
                 }
@@ -68,26 +69,28 @@ def run(project_config: dict, run_id: str, registry: ArtifactRegistry) -> dict:
 
     character_packs: list[dict] = [
         {
-            "asset_id": f"char-{_to_slug(cid)}",
-            "pack_id": f"char-{_to_slug(cid)}",
-            "character_id": _to_slug(cid),
+            "asset_id": f"char-{slug}",
+            "pack_id": f"char-{slug}",
+            "character_id": slug,
             "display_name": cid,
             "license_type": "proprietary_cleared",
             "is_placeholder": True,
         }
         for cid in sorted(seen_character_ids)
+        for slug in (_to_slug(cid),)
     ]
 
     backgrounds: list[dict] = [
         {
-            "asset_id": f"bg-{_to_slug(scene_id)}",
-            "bg_id": f"bg-{_to_slug(scene_id)}",
+            "asset_id": bg_id,
+            "bg_id": bg_id,
             "scene_id": scene_id,
             "description": description,
             "license_type": "proprietary_cleared",
             "is_placeholder": True,
         }
         for scene_id, description in seen_scenes.items()
+        for bg_id in (f"bg-{_to_slug(scene_id)}",)
     ]
 
     # episode_id: read from ShotList if present (optional field), fall back to "s01e01"
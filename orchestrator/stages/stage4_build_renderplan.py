@@ -21,6 +21,7 @@ before and no ``locale_tracks`` key is emitted.
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from ..registry import ArtifactRegistry
@@ -43,6 +44,9 @@ _ASSET_TYPE_COLOR: dict[str, str] = {
 # solid-colour PNGs so the renderer's own stub guard never fires.
 _MIN_REAL_ASSET_BYTES = 100
 
+# Upper bound on threads used to materialise placeholder PNGs in _process_items.
+_PLACEHOLDER_WORKERS = 4
+
 
 def _is_stub_uri(uri: str) -> bool:
     """Return True when *uri* is a ``file://`` that points to a stub (≤ _MIN_REAL_ASSET_BYTES).
@@ -180,17 +184,42 @@ def _process_items(media: dict, run_dir: Path) -> list[dict]:
 
     Non-visual assets (vo, sfx, music) pass through unchanged.
     Returns a new list; original media dict is not mutated.
+
+    Placeholder PNGs are independent of one another, so they are generated on a
+    small thread pool (PNG encoding and file writes release the GIL).  Each
+    asset_id is generated once; item order is preserved.
     """
-    final_items: list[dict] = []
-    for item in media.get("items", []):
-        uri = item["uri"]
-        is_placeholder = item["is_placeholder"]
+    items: list[dict] = list(media.get("items", []))
+
+    needs_placeholder = [
+        item["asset_type"] in _VISUAL_ASSET_TYPES
+        and (item["is_placeholder"] or _is_stub_uri(item["uri"]))
+        for item in items
+    ]
+
+    # asset_id → asset_type for every visual item that needs a placeholder.
+    pending: dict[str, str] = {}
+    for item, needed in zip(items, needs_placeholder):
+        if needed:
+            pending.setdefault(item["asset_id"], item["asset_type"])
+
+    if not pending:
+        return items
 
-        if (is_placeholder or _is_stub_uri(uri)) and item["asset_type"] in _VISUAL_ASSET_TYPES:
-            file_uri = _generate_visual_placeholder(item["asset_id"], item["asset_type"], run_dir)
-            if file_uri:
-                item = {**item, "uri": file_uri, "is_placeholder": False}
+    def _generate(asset_id: str) -> str | None:
+        return _generate_visual_placeholder(asset_id, pending[asset_id], run_dir)
 
+    if len(pending) == 1:
+        generated = {asset_id: _generate(asset_id) for asset_id in pending}
+    else:
+        with ThreadPoolExecutor(max_workers=min(_PLACEHOLDER_WORKERS, len(pending))) as pool:
+            generated = dict(zip(pending, pool.map(_generate, pending)))
+
+    final_items: list[dict] = []
+    for item, needed in zip(items, needs_placeholder):
+        file_uri = generated[item["asset_id"]] if needed else None
+        if file_uri:
+            item = {**item, "uri": file_uri, "is_placeholder": False}
         final_items.append(item)
     return final_items
 
@@ -214,6 +243,15 @@ def _build_asset_manifest_final(draft: dict, items: list[dict], locale: str | No
     }
 
 
+def _split_vo(items: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Partition *items* into (non-VO, VO) lists in one pass, preserving order."""
+    non_vo: list[dict] = []
+    vo: list[dict] = []
+    for item in items:
+        (vo if item["asset_type"] == "vo" else non_vo).append(item)
+    return non_vo, vo
+
+
 def _project_asset(item: dict) -> dict:
     """Project a full resolved-asset item to the compact RenderPlan asset shape."""
     return {
@@ -326,13 +364,12 @@ def run(project_config: dict, run_id: str, registry: ArtifactRegistry) -> dict:
     # -----------------------------------------------------------------------
     if locales:
         # Shared assets: non-VO items from base media (same across all locales)
-        non_vo_items = [item for item in base_final_items if item["asset_type"] != "vo"]
+        non_vo_items, base_vo = _split_vo(base_final_items)
         resolved_assets = [_project_asset(item) for item in non_vo_items]
 
         # locale_tracks: VO per locale (including base as "default")
         locale_tracks: dict[str, dict] = {}
 
-        base_vo = [item for item in base_final_items if item["asset_type"] == "vo"]
         if base_vo:
             locale_tracks["default"] = {
                 "vo_assets": [_project_asset(item) for item in base_vo],
@@ -359,7 +396,7 @@ def run(project_config: dict, run_id: str, registry: ArtifactRegistry) -> dict:
             )
             logger.info("Wrote %s", locale_final_path.name)
 
-            locale_vo = [item for item in locale_final_items if item["asset_type"] == "vo"]
+            _, locale_vo = _split_vo(locale_final_items)
             locale_tracks[locale] = {
                 "vo_assets": [_project_asset(item) for item in locale_vo],
             }
@@ -46,7 +46,7 @@ def run(project_config: dict, run_id: str, registry: ArtifactRegistry) -> dict:
     # 1. Check for all-placeholder RenderPlan — skip renderer entirely.
     # ------------------------------------------------------------------
     try:
-        plan     = json.loads(plan_path.read_text(encoding="utf-8"))
+        plan     = json.loads(plan_path.read_bytes())
         resolved = plan.get("resolved_assets", [])
         all_placeholder = bool(resolved) and all(
             a.get("is_placeholder", False) for a in resolved
@@ -132,7 +132,7 @@ def run(project_config: dict, run_id: str, registry: ArtifactRegistry) -> dict:
     # 4. Read RenderOutput from disk (§41 file-flow — not stdout).
     # ------------------------------------------------------------------
     try:
-        ro = json.loads(ro_path.read_text(encoding="utf-8"))
+        ro = json.loads(ro_path.read_bytes())
     except (OSError, json.JSONDecodeError) as exc:
         raise ValueError(
             f"`video render` succeeded but RenderOutput.json was not written "
@@ -0,0 +1,27 @@
+"""Small filesystem helpers shared by the registry and the pipeline."""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write *data* to a unique sibling temp file, fsync it, then os.replace() it onto *path*.
+
+    Readers never observe a half-written file, concurrent writers never share
+    a temp file, and a failed write removes its temp file.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        try:
+            os.chmod(tmp, 0o644)  # mkstemp creates 0o600
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
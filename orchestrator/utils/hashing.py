@@ -5,31 +5,46 @@ import json
 from pathlib import Path
 
 
+# json.dumps() builds a fresh JSONEncoder on every call once any non-default
+# option is passed; the canonical encoder is stateless, so build it once.
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+
 def canonical_json_bytes(data: dict) -> bytes:
     """Stable serialisation: sorted keys, no extra whitespace.
 
     json.dumps(sort_keys=True) recursively sorts all nested dict keys.
+    Output is ASCII-escaped (ensure_ascii), so every existing hash is unchanged.
     """
-    return json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return _CANONICAL_ENCODER.encode(data).encode("utf-8")
 
 
-def hash_artifact(data: dict) -> str:
+def hash_artifact(data: dict, cache: dict[int, tuple[dict, str]] | None = None) -> str:
     """SHA-256 hex digest of canonical JSON.
 
     Nested dicts are also sorted via json.dumps(sort_keys=True).
     Returns a 64-character lowercase hex string.
+
+    *cache* is an optional caller-owned ``id(data) → (data, digest)`` map that
+    memoises the digest by object identity (the dict is held so its id cannot
+    be recycled).  A dict hashed through a cache must not be mutated
+    afterwards, or later lookups return its old digest.
     """
-    return hashlib.sha256(canonical_json_bytes(data)).hexdigest()
+    if cache is not None:
+        hit = cache.get(id(data))
+        if hit is not None and hit[0] is data:
+            return hit[1]
+    digest = hashlib.sha256(canonical_json_bytes(data)).hexdigest()
+    if cache is not None:
+        cache[id(data)] = (data, digest)
+    return digest
 
 
-def hash_file_bytes(path: Path) -> str:
+def hash_file_bytes(path: Path | str) -> str:
     """SHA-256 hex digest of raw file bytes (byte-for-byte, NOT canonical JSON).
 
     Not compatible with hash_artifact — they hash the same content differently.
     Used exclusively by RunIndex.json to record stable file-content fingerprints.
     """
-    h = hashlib.sha256()
     with open(path, "rb") as fh:
-        for chunk in iter(lambda: fh.read(65536), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        return hashlib.file_digest(fh, "sha256").hexdigest()
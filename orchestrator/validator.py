@@ -19,9 +19,34 @@ ARTIFACT_SCHEMAS: dict[str, str] = {
 
 SCHEMAS_DIR = Path(__file__).parent.parent / "contracts" / "schemas"
 
+# artifact_type → compiled validator.  Each schema is read and compiled on the
+# first validate_artifact() call for its type, so a missing or broken schema
+# only affects that type.  Plain per-process state: no lock, and each worker
+# process (e.g. pytest-xdist) fills its own.
+_VALIDATOR_CACHE: dict[str, jsonschema.protocols.Validator] = {}
+
+
+def _get_validator(artifact_type: str) -> jsonschema.protocols.Validator:
+    """Return the cached validator for *artifact_type*, loading it on first use.
+
+    The schema itself is checked once here, matching jsonschema.validate().
+    """
+    validator = _VALIDATOR_CACHE.get(artifact_type)
+    if validator is None:
+        schema_file = SCHEMAS_DIR / ARTIFACT_SCHEMAS[artifact_type]
+        schema = json.loads(schema_file.read_text(encoding="utf-8"))
+        cls = jsonschema.validators.validator_for(schema)
+        cls.check_schema(schema)
+        validator = _VALIDATOR_CACHE[artifact_type] = cls(schema)
+    return validator
+
 
 def validate_artifact(data: dict, artifact_type: str) -> None:
-    """Load schema from disk and validate data against it.
+    """Validate data against the schema for *artifact_type*.
+
+    The schema is loaded and compiled once per type per process; valid data
+    takes the is_valid() fast path, and only failures pay for best_match()
+    error selection (the same error jsonschema.validate() would raise).
 
     Args:
         data: The artifact dict to validate.
@@ -32,7 +57,9 @@ def validate_artifact(data: dict, artifact_type: str) -> None:
         jsonschema.ValidationError: If data does not conform to the schema.
         jsonschema.SchemaError: If the schema file itself is malformed.
     """
-    schema_filename = ARTIFACT_SCHEMAS[artifact_type]
-    schema_file = SCHEMAS_DIR / schema_filename
-    schema = json.loads(schema_file.read_text(encoding="utf-8"))
-    jsonschema.validate(instance=data, schema=schema)
+    validator = _get_validator(artifact_type)
+    if validator.is_valid(data):
+        return
+    error = jsonschema.exceptions.best_match(validator.iter_errors(data))
+    if error is not None:
+        raise error
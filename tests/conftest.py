@@ -0,0 +1,239 @@
+"""Shared pytest fixtures: stage stubs and project files for the pipeline and determinism tests."""
+
+import json
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from orchestrator.cli import cli
+from orchestrator.stages import (
+    stage1_generate_script,
+    stage2_script_to_shotlist,
+    stage3_shotlist_to_assetmanifest,
+    stage4_build_renderplan,
+    stage5_render_preview,
+)
+
+
+# ---------------------------------------------------------------------------
+# Stub helpers — bypass registry.write_artifact to avoid schema validation
+# ---------------------------------------------------------------------------
+
+def _write_artifact_bytes(
+    registry, project_id: str, run_id: str, artifact_type: str, payload: bytes
+) -> None:
+    """Write already-encoded artifact JSON directly to the run directory."""
+    run_dir = registry.run_dir(project_id, run_id)
+    run_dir.mkdir(parents=True, exist_ok=True)
+    (run_dir / f"{artifact_type}.json").write_bytes(payload)
+
+
+# The CLI only json-parses stub artifacts, so they are written compact.
+_STUB_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def _encode(data: dict) -> bytes:
+    return _STUB_ENCODER.encode(data).encode("utf-8")
+
+
+def _write_artifact_json(
+    registry, project_id: str, run_id: str, artifact_type: str, data: dict
+) -> None:
+    """Write artifact JSON directly to the run directory."""
+    _write_artifact_bytes(registry, project_id, run_id, artifact_type, _encode(data))
+
+
+def _static_stub(artifact_type: str, data: dict):
+    """Stage stub that always writes *data*; the JSON is encoded once, here."""
+    payload = _encode(data)
+
+    def stub(project_config, run_id, registry):
+        _write_artifact_bytes(registry, project_config["id"], run_id, artifact_type, payload)
+        return data
+
+    return stub
+
+
+# Default stubs (stable, no run-id embedding)
+_stage1_stub = _static_stub("Script", {
+    "schema_id": "Script",
+    "schema_version": "1.0.0",
+    "script_id": "script-stub",
+    "title": "Test",
+})
+
+_stage2_stub = _static_stub("ShotList", {
+    "schema_id": "ShotList",
+    "schema_version": "1.0.0",
+    "shotlist_id": "sl-001",
+    "timing_lock_hash": "abc",
+    "total_duration_sec": 60.0,
+    "created_at": "2026-01-01T00:00:00Z",
+})
+
+_stage3_stub = _static_stub("AssetManifest_draft", {
+    "schema_id": "AssetManifest_draft",
+    "schema_version": "1.0.0",
+    "manifest_id": "am-001",
+    "shotlist_ref": "sl-001",
+})
+
+_stage4_stub = _static_stub("RenderPlan", {
+    "schema_id": "RenderPlan",
+    "schema_version": "1.0.0",
+    "plan_id": "rp-001",
+    "manifest_ref": "am-001",
+})
+
+_RENDER_OUTPUT = {
+    "schema_id": "RenderOutput",
+    "schema_version": "1.0.0",
+    "output_id": "ro-001",
+    "video_uri": "file:///tmp/stable_video.mp4",
+    "captions_uri": "file:///tmp/stable_captions.srt",
+    "hashes": {"video_sha256": "aabbcc", "captions_sha256": "ddeeff"},
+}
+_RENDER_OUTPUT_BYTES = _encode(_RENDER_OUTPUT)
+_VIDEO_BYTES = b"\x00video"
+_CAPTIONS_BYTES = b"1\n00:00:00,000 --> 00:00:01,000\nTest\n"
+
+
+def _stage5_stub(project_config, run_id, registry):
+    pid = project_config["id"]
+    run_dir = registry.run_dir(pid, run_id)
+    render_dir = run_dir / "render_preview"
+    render_dir.mkdir(parents=True, exist_ok=True)
+    (render_dir / "video.mp4").write_bytes(_VIDEO_BYTES)
+    (render_dir / "captions.srt").write_bytes(_CAPTIONS_BYTES)
+    _write_artifact_bytes(registry, pid, run_id, "RenderOutput", _RENDER_OUTPUT_BYTES)
+    return _RENDER_OUTPUT
+
+
+# ---------------------------------------------------------------------------
+# PipelineRunner stage 5 stub — a schema-valid RenderOutput written through the
+# registry, so pipeline tests run without the real video renderer
+# ---------------------------------------------------------------------------
+
+_PIPELINE_RENDER_OUTPUT = {
+    "schema_version": "1.0.0",
+    "schema_id": "RenderOutput",
+    "output_id": "test-output-001",
+    "video_uri": "file:///tmp/test/output.mp4",
+    "captions_uri": "file:///tmp/test/output.srt",
+    "hashes": {
+        "video_sha256": "a" * 64,
+        "captions_sha256": "b" * 64,
+    },
+}
+
+
+def _pipeline_stage5_stub(project_config, run_id, registry):
+    pid = project_config["id"]
+    ro = _PIPELINE_RENDER_OUTPUT | {"project_id": pid}
+    registry.write_artifact(
+        pid, run_id, "RenderOutput", ro,
+        parent_refs=[],
+        creation_params={"stage": "stage5_render_preview"},
+    )
+    return ro
+
+
+# Maps stage modules → default run() stubs
+_STAGE_PATCH_TARGETS = [
+    (stage1_generate_script, _stage1_stub),
+    (stage2_script_to_shotlist, _stage2_stub),
+    (stage3_shotlist_to_assetmanifest, _stage3_stub),
+    (stage4_build_renderplan, _stage4_stub),
+    (stage5_render_preview, _stage5_stub),
+]
+
+
+# CliRunner keeps no state between invoke() calls, so one instance serves all
+# tests. stderr is kept apart: every asserted line is on stdout.
+_RUNNER = CliRunner(mix_stderr=False)
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def write_project_file(tmp_path_factory):
+    """write_project_file(config) → path of a fresh project.json holding *config*."""
+    def _write(config: dict) -> Path:
+        path = tmp_path_factory.mktemp("project") / "project.json"
+        path.write_text(json.dumps(config), encoding="utf-8")
+        return path
+    return _write
+
+
+@pytest.fixture(scope="session")
+def cli_runner() -> CliRunner:
+    """The shared in-process CliRunner."""
+    return _RUNNER
+
+
+@pytest.fixture
+def investigate():
+    """investigate(project_file, out_dir, **invoke_kwargs) → (result, report).
+
+    Runs ``investigate-determinism`` in-process and parses the
+    DeterminismReport.json it wrote into *out_dir*.
+    """
+    def _investigate(project_file, out_dir, **invoke_kwargs):
+        result = _RUNNER.invoke(cli, [
+            "investigate-determinism",
+            "--project", str(project_file),
+            "--out", str(out_dir),
+        ], **invoke_kwargs)
+        report = json.loads((out_dir / "DeterminismReport.json").read_bytes())
+        return result, report
+
+    return _investigate
+
+
+@pytest.fixture
+def patched_stages(monkeypatch):
+    """Context-manager factory stubbing all 5 stage run() functions.
+
+    ``with patched_stages(overrides):`` swaps each stage module's ``run`` via
+    monkeypatch for the duration of the block.  overrides: optional dict
+    mapping stage module → replacement run() function.
+    """
+    @contextmanager
+    def _patched_stages(overrides=None):
+        stubs = dict(_STAGE_PATCH_TARGETS)
+        if overrides:
+            stubs.update(overrides)
+        with monkeypatch.context() as m:
+            for module, fn in stubs.items():
+                m.setattr(module, "run", fn)
+            yield
+
+    return _patched_stages
+
+
+@pytest.fixture
+def write_artifact_json():
+    """_write_artifact_json(registry, project_id, run_id, artifact_type, data)."""
+    return _write_artifact_json
+
+
+@pytest.fixture
+def render_preview_stub():
+    """The default stage 5 stub: render_preview media + a stable RenderOutput."""
+    return _stage5_stub
+
+
+@pytest.fixture(scope="session")
+def pipeline_stage5_stub():
+    """stage5_render_preview.run replacement for PipelineRunner tests."""
+    return _pipeline_stage5_stub
+
+
+@pytest.fixture
+def mock_stage5(monkeypatch):
+    """Patch stage5_render_preview.run to avoid needing the real video renderer."""
+    monkeypatch.setattr(stage5_render_preview, "run", _pipeline_stage5_stub)
@@ -56,3 +56,26 @@ class TestHashArtifact:
         h1 = hash_artifact({"b": 2, "a": 1})
         h2 = hash_artifact({"a": 1, "b": 2})
         assert h1 == h2
+
+
+class TestHashCache:
+    def test_cached_digest_matches_uncached(self):
+        data = {"key": "value", "nested": {"b": 2, "a": 1}}
+        expected = hash_artifact(data)
+        cache: dict = {}
+        assert hash_artifact(data, cache) == expected
+        assert hash_artifact(data, cache) == expected
+
+    def test_cache_is_identity_keyed(self):
+        """Equal-but-distinct dicts are hashed independently through one cache."""
+        cache: dict = {}
+        h1 = hash_artifact({"key": "value1"}, cache)
+        h2 = hash_artifact({"key": "value2"}, cache)
+        assert h1 != h2
+
+    def test_uncached_call_sees_mutation(self):
+        """Without a cache, mutations are reflected in the next hash."""
+        data = {"key": "value1"}
+        h1 = hash_artifact(data, {})
+        data["key"] = "value2"
+        assert hash_artifact(data) != h1
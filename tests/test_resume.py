@@ -1,48 +1,13 @@
 """Tests for ArtifactRegistry existence/validity checks and PipelineRunner resume logic."""
 
 import json
-from unittest.mock import patch
+import shutil
 
 import pytest
 
 from orchestrator.pipeline import PipelineRunner, compute_run_id
 from orchestrator.registry import ArtifactRegistry
 
-# ---------------------------------------------------------------------------
-# Stage 5 stub — used by pipeline-level tests so they don't need the real
-# video renderer binary.
-# ---------------------------------------------------------------------------
-
-_STUB_RENDER_OUTPUT = {
-    "schema_version": "1.0.0",
-    "schema_id": "RenderOutput",
-    "output_id": "test-output-001",
-    "video_uri": "file:///tmp/test/output.mp4",
-    "captions_uri": "file:///tmp/test/output.srt",
-    "hashes": {
-        "video_sha256": "a" * 64,
-        "captions_sha256": "b" * 64,
-    },
-}
-
-
-@pytest.fixture()
-def mock_stage5():
-    """Patch stage5_render_preview.run to avoid needing the real video renderer."""
-
-    def _stub(project_config, run_id, registry):
-        pid = project_config["id"]
-        ro = {**_STUB_RENDER_OUTPUT, "project_id": pid}
-        registry.write_artifact(
-            pid, run_id, "RenderOutput", ro,
-            parent_refs=[],
-            creation_params={"stage": "stage5_render_preview"},
-        )
-        return ro
-
-    with patch("orchestrator.stages.stage5_render_preview.run", side_effect=_stub):
-        yield
-
 # ---------------------------------------------------------------------------
 # Shared project config used across all pipeline tests
 # ---------------------------------------------------------------------------
@@ -160,15 +125,52 @@ class TestHashMismatchInvalidatesArtifact:
             "proj", "run-006", "Script", VALID_SCRIPT,
             parent_refs=[], creation_params={}
         )
-        # Overwrite artifact with a different (still schema-valid) Script; leave meta unchanged
-        modified_script = {**VALID_SCRIPT, "title": "Modified Title"}
+        # Poke one byte of the title (still schema-valid, same size); leave meta unchanged
         path = registry.artifact_path("proj", "run-006", "Script")
-        path.write_text(
-            json.dumps(modified_script, indent=2, sort_keys=True), encoding="utf-8"
-        )
+        path.write_bytes(path.read_bytes().replace(b'"Test Script"', b'"Xest Script"', 1))
         assert registry.exists_and_valid("proj", "run-006", "Script") is False
 
 
+class TestRecordedFileSha256:
+    def test_matches_file_bytes_until_rewritten(self, registry):
+        """get_file_sha256 returns the written digest, then None once the file changes."""
+        from orchestrator.utils.hashing import hash_file_bytes
+
+        registry.write_artifact(
+            "proj", "run-011", "Script", VALID_SCRIPT,
+            parent_refs=[], creation_params={}
+        )
+        path = registry.artifact_path("proj", "run-011", "Script")
+        assert registry.get_file_sha256(path) == hash_file_bytes(path)
+
+        path.write_text(json.dumps(VALID_SCRIPT), encoding="utf-8")
+        assert registry.get_file_sha256(path) is None
+
+
+class TestAtomicWrite:
+    def test_failed_write_keeps_old_file_and_leaves_no_temp(self, registry, monkeypatch):
+        """A write that fails before os.replace leaves the previous artifact untouched."""
+        registry.write_artifact(
+            "proj", "run-012", "Script", VALID_SCRIPT,
+            parent_refs=[], creation_params={}
+        )
+        path = registry.artifact_path("proj", "run-012", "Script")
+        before = path.read_bytes()
+        entries = sorted(p.name for p in path.parent.iterdir())
+
+        def _failing_fsync(fd):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("orchestrator.utils.fileio.os.fsync", _failing_fsync)
+        with pytest.raises(OSError, match="disk full"):
+            registry.write_artifact(
+                "proj", "run-012", "Script", VALID_SCRIPT | {"title": "Other"},
+                parent_refs=[], creation_params={}
+            )
+        assert path.read_bytes() == before
+        assert sorted(p.name for p in path.parent.iterdir()) == entries
+
+
 # ---------------------------------------------------------------------------
 # PipelineRunner tests
 # ---------------------------------------------------------------------------
@@ -191,33 +193,55 @@ _MEDIA_MANIFEST_STUB = {
 }
 
 
-class TestPipelineSkipsExistingStage:
-    def test_pipeline_skips_existing_stage(self, tmp_path, mock_stage5):
-        """Second run (no force) skips all stages whose artifacts are already valid."""
-        registry = ArtifactRegistry(tmp_path)
-        run_id = compute_run_id(PROJECT_CONFIG)
-
-        # Pre-write CanonDecision.json (allow) so the gate passes for stage5
-        run_dir = tmp_path / PROJECT_CONFIG["id"] / run_id
-        run_dir.mkdir(parents=True, exist_ok=True)
-        (run_dir / "CanonDecision.json").write_text(
-            json.dumps(_CANON_ALLOW), encoding="utf-8"
-        )
-        # Stage 4 requires AssetManifest.media.json as an external input
-        (run_dir / "AssetManifest.media.json").write_text(
-            json.dumps(_MEDIA_MANIFEST_STUB), encoding="utf-8"
-        )
-
-        # First run — all stages execute
-        runner1 = PipelineRunner(
+def _prepare_run_dir(root) -> tuple[ArtifactRegistry, str]:
+    """Write the external inputs (CanonDecision allow, media stub) under *root*."""
+    run_id = compute_run_id(PROJECT_CONFIG)
+    run_dir = root / PROJECT_CONFIG["id"] / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    # Pre-write CanonDecision.json (allow) so the gate passes for stage5
+    (run_dir / "CanonDecision.json").write_text(
+        json.dumps(_CANON_ALLOW), encoding="utf-8"
+    )
+    # Stage 4 requires AssetManifest.media.json as an external input
+    (run_dir / "AssetManifest.media.json").write_text(
+        json.dumps(_MEDIA_MANIFEST_STUB), encoding="utf-8"
+    )
+    return ArtifactRegistry(root), run_id
+
+
+@pytest.fixture(scope="module")
+def populated_run(tmp_path_factory, pipeline_stage5_stub):
+    """One full first run shared by the rerun tests: (summary, artifacts root).
+
+    Tests copy the tree rather than hard-linking it, so nothing a rerun
+    writes (run_summary.json, RunIndex.json, ...) can reach the shared tree.
+    """
+    root = tmp_path_factory.mktemp("populated")
+    registry, run_id = _prepare_run_dir(root)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("orchestrator.stages.stage5_render_preview.run", pipeline_stage5_stub)
+        summary = PipelineRunner(
             project_config=PROJECT_CONFIG,
             registry=registry,
-            artifacts_dir=tmp_path,
+            artifacts_dir=root,
             force=False,
             run_id=run_id,
-        )
-        summary1 = runner1.run()
-        assert summary1["status"] == "completed"
+        ).run()
+    assert summary["status"] == "completed"
+    return summary, root
+
+
+def _copy_populated(populated_run, tmp_path) -> tuple[dict, ArtifactRegistry, str]:
+    summary, root = populated_run
+    shutil.copytree(root, tmp_path, dirs_exist_ok=True)
+    return summary, ArtifactRegistry(tmp_path), compute_run_id(PROJECT_CONFIG)
+
+
+class TestPipelineSkipsExistingStage:
+    def test_pipeline_skips_existing_stage(self, tmp_path, populated_run, mock_stage5):
+        """Second run (no force) skips all stages whose artifacts are already valid."""
+        # First run (all stages executed) comes from the shared populated tree
+        _, registry, run_id = _copy_populated(populated_run, tmp_path)
 
         # Second run — all stages should be skipped
         runner2 = PipelineRunner(
@@ -234,31 +258,9 @@ class TestPipelineSkipsExistingStage:
 
 
 class TestPipelineForceReruns:
-    def test_pipeline_force_reruns(self, tmp_path, mock_stage5):
+    def test_pipeline_force_reruns(self, tmp_path, populated_run, mock_stage5):
         """force=True causes all stages to re-execute; hashes are identical (determinism)."""
-        registry = ArtifactRegistry(tmp_path)
-        run_id = compute_run_id(PROJECT_CONFIG)
-
-        # Pre-write CanonDecision.json (allow) so the gate passes for stage5
-        run_dir = tmp_path / PROJECT_CONFIG["id"] / run_id
-        run_dir.mkdir(parents=True, exist_ok=True)
-        (run_dir / "CanonDecision.json").write_text(
-            json.dumps(_CANON_ALLOW), encoding="utf-8"
-        )
-        # Stage 4 requires AssetManifest.media.json as an external input
-        (run_dir / "AssetManifest.media.json").write_text(
-            json.dumps(_MEDIA_MANIFEST_STUB), encoding="utf-8"
-        )
-
-        runner1 = PipelineRunner(
-            project_config=PROJECT_CONFIG,
-            registry=registry,
-            artifacts_dir=tmp_path,
-            force=True,
-            run_id=run_id,
-        )
-        summary1 = runner1.run()
-        assert summary1["status"] == "completed"
+        summary1, registry, run_id = _copy_populated(populated_run, tmp_path)
 
         runner2 = PipelineRunner(
             project_config=PROJECT_CONFIG,
@@ -283,32 +285,10 @@ class TestPipelineForceReruns:
 
 
 class TestFromStageReruns:
-    def test_from_stage_reruns_from_n(self, tmp_path, mock_stage5):
+    def test_from_stage_reruns_from_n(self, tmp_path, populated_run, mock_stage5):
         """from_stage=3, to_last_stage=True skips stages 1–2, re-runs stages 3–5."""
-        registry = ArtifactRegistry(tmp_path)
-        run_id = compute_run_id(PROJECT_CONFIG)
-
-        # Pre-write CanonDecision.json (allow) so the gate passes for stage5
-        run_dir = tmp_path / PROJECT_CONFIG["id"] / run_id
-        run_dir.mkdir(parents=True, exist_ok=True)
-        (run_dir / "CanonDecision.json").write_text(
-            json.dumps(_CANON_ALLOW), encoding="utf-8"
-        )
-        # Stage 4 requires AssetManifest.media.json as an external input
-        (run_dir / "AssetManifest.media.json").write_text(
-            json.dumps(_MEDIA_MANIFEST_STUB), encoding="utf-8"
-        )
-
-        # Full first run to populate all artifacts
-        runner1 = PipelineRunner(
-            project_config=PROJECT_CONFIG,
-            registry=registry,
-            artifacts_dir=tmp_path,
-            force=False,
-            run_id=run_id,
-        )
-        summary1 = runner1.run()
-        assert summary1["status"] == "completed"
+        # Full first run to populate all artifacts comes from the shared tree
+        _, registry, run_id = _copy_populated(populated_run, tmp_path)
 
         # Re-run from stage 3 with force so stages 3-5 actually execute
         runner2 = PipelineRunner(
@@ -1,15 +1,18 @@
 """Tests for RunIndex.json generation, explain, and replay commands."""
 
+import copy
+import hashlib
 import json
+import os
 import re
-import time
+import shutil
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 from click.testing import CliRunner
 
-from orchestrator.cli import cli
+from orchestrator.cli import cli, run_replay
 from orchestrator.pipeline import (
     PipelineRunner,
     _ContinuationMissing,
@@ -23,21 +26,15 @@ from orchestrator.pipeline import (
 from orchestrator.registry import ArtifactRegistry
 from orchestrator.utils.hashing import hash_artifact, hash_file_bytes
 
-# ---------------------------------------------------------------------------
-# Stage 5 stub — identical to test_resume.py (each test file is self-contained)
-# ---------------------------------------------------------------------------
+# One runner for every CLI invocation; stderr kept out of result.output.
+RUNNER = CliRunner(mix_stderr=False)
 
-_STUB_RENDER_OUTPUT = {
-    "schema_version": "1.0.0",
-    "schema_id": "RenderOutput",
-    "output_id": "test-output-001",
-    "video_uri": "file:///tmp/test/output.mp4",
-    "captions_uri": "file:///tmp/test/output.srt",
-    "hashes": {
-        "video_sha256": "a" * 64,
-        "captions_sha256": "b" * 64,
-    },
-}
+# Patterns shared by the hash and explain-output assertions.
+_SHA256_RE = re.compile(r"\b[0-9a-f]{64}\b")
+_ISO8601_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
+_STAGE1_INPUTS_RE = re.compile(
+    r"stage1_generate_script.*?inputs:(?P<inputs>.*?)outputs:", re.DOTALL
+)
 
 # ---------------------------------------------------------------------------
 # CanonDecision fixtures used across Wave2 and Wave3 tests
@@ -57,24 +54,7 @@ _CANON_DENY = {
     "reasons": ["FORBIDDEN_TOKEN"],
     "decision_id": "test-deny-01",
 }
-
-
-@pytest.fixture()
-def mock_stage5():
-    """Patch stage5_render_preview.run to avoid needing the real video renderer."""
-
-    def _stub(project_config, run_id, registry):
-        pid = project_config["id"]
-        ro = {**_STUB_RENDER_OUTPUT, "project_id": pid}
-        registry.write_artifact(
-            pid, run_id, "RenderOutput", ro,
-            parent_refs=[],
-            creation_params={"stage": "stage5_render_preview"},
-        )
-        return ro
-
-    with patch("orchestrator.stages.stage5_render_preview.run", side_effect=_stub):
-        yield
+_CANON_DENY_BYTES = json.dumps(_CANON_DENY).encode()
 
 
 # ---------------------------------------------------------------------------
@@ -91,6 +71,7 @@ PROJECT_CONFIG: dict = {
     "continuity_mode": "sequential",
     "cost_policy": {"max_budget_usd": 0.0, "external_ai": "disabled"},
 }
+_PROJECT_JSON_BYTES = json.dumps(PROJECT_CONFIG).encode()
 
 
 # ---------------------------------------------------------------------------
@@ -145,6 +126,53 @@ def _run_full_pipeline(
     return summary, run_dir
 
 
+@pytest.fixture(scope="session")
+def baseline_run(tmp_path_factory, pipeline_stage5_stub) -> tuple[dict, Path]:
+    """Default ``_run_full_pipeline`` run, executed once per session (stage5 stubbed).
+
+    Returns (summary, artifacts root).  Tests take a private copy with
+    ``_copy_baseline`` instead of re-running all five stages.  The root comes
+    from tmp_path_factory, which is already per-worker under pytest-xdist, so
+    each worker builds its own baseline and never shares a directory.
+    """
+    root = tmp_path_factory.mktemp("baseline")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("orchestrator.stages.stage5_render_preview.run", pipeline_stage5_stub)
+        summary, _ = _run_full_pipeline(root)
+    return summary, root
+
+
+@pytest.fixture(scope="session")
+def _baseline_index(baseline_run) -> dict:
+    """RunIndex.json of the session baseline, parsed once."""
+    _, root = baseline_run
+    run_dir = root / PROJECT_CONFIG["id"] / compute_run_id(PROJECT_CONFIG)
+    return json.loads((run_dir / "RunIndex.json").read_bytes())
+
+
+@pytest.fixture
+def run_index(_baseline_index) -> dict:
+    """Per-test deep copy of the baseline RunIndex (safe to mutate)."""
+    return copy.deepcopy(_baseline_index)
+
+
+def _copy_baseline(baseline_run: tuple[dict, Path], tmp_path: Path) -> tuple[dict, Path]:
+    """Copy the session baseline into *tmp_path*; same return shape as _run_full_pipeline."""
+    summary, root = baseline_run
+    shutil.copytree(root, tmp_path, dirs_exist_ok=True)
+    run_dir = tmp_path / PROJECT_CONFIG["id"] / compute_run_id(PROJECT_CONFIG)
+    return copy.deepcopy(summary), run_dir
+
+
+def _append_byte(path: Path, b: bytes = b" ") -> None:
+    """Append *b* to *path* with a single unbuffered write (corrupts its hash)."""
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+    try:
+        os.write(fd, b)
+    finally:
+        os.close(fd)
+
+
 # ===========================================================================
 # TestHashFileBytes
 # ===========================================================================
@@ -159,7 +187,7 @@ class TestHashFileBytes:
         f = tmp_path / "data.bin"
         f.write_bytes(b"some content")
         h = hash_file_bytes(f)
-        assert re.fullmatch(r"[0-9a-f]{64}", h) is not None
+        assert _SHA256_RE.fullmatch(h) is not None
 
     def test_differs_from_hash_artifact(self, tmp_path):
         """hash_file_bytes and hash_artifact produce different digests for the same data."""
@@ -185,20 +213,29 @@ class TestHashFileBytes:
         h2 = hash_file_bytes(f)
         assert h1 == h2
 
+    def test_matches_sha256_across_read_buffers(self, tmp_path):
+        """Files larger than one read buffer (and empty files) hash like hashlib.sha256."""
+        for size in (0, 65536, 3 * 65536 + 17):
+            payload = bytes(i % 251 for i in range(size))
+            f = tmp_path / f"data-{size}.bin"
+            f.write_bytes(payload)
+            assert hash_file_bytes(f) == hashlib.sha256(payload).hexdigest()
+
 
 # ===========================================================================
 # TestWriteRunIndex
 # ===========================================================================
 
 class TestWriteRunIndex:
-    def test_file_created(self, tmp_path, mock_stage5):
-        summary, run_dir = _run_full_pipeline(tmp_path)
+    def test_file_created(self, tmp_path, baseline_run):
+        summary, run_dir = _copy_baseline(baseline_run, tmp_path)
         assert summary["status"] == "completed"
         assert (run_dir / "RunIndex.json").exists()
+        on_disk = json.loads((run_dir / "RunIndex.json").read_bytes())
+        assert summary["run_index"] == on_disk
 
-    def test_schema_fields(self, tmp_path, mock_stage5):
-        _, run_dir = _run_full_pipeline(tmp_path)
-        idx = json.loads((run_dir / "RunIndex.json").read_text(encoding="utf-8"))
+    def test_schema_fields(self, run_index):
+        idx = run_index
         assert idx["schema_id"] == "RunIndex"
         assert idx["schema_version"] == "0.0.2"
         assert "run_id" in idx
@@ -206,31 +243,28 @@ class TestWriteRunIndex:
         assert idx["pipeline_version"] == "phase0"
         assert isinstance(idx["stages"], list)
 
-    def test_five_stages(self, tmp_path, mock_stage5):
-        _, run_dir = _run_full_pipeline(tmp_path)
-        idx = json.loads((run_dir / "RunIndex.json").read_text(encoding="utf-8"))
+    def test_five_stages(self, run_index):
+        idx = run_index
         assert len(idx["stages"]) == 5
 
-    def test_stage1_empty_inputs(self, tmp_path, mock_stage5):
-        _, run_dir = _run_full_pipeline(tmp_path)
-        idx = json.loads((run_dir / "RunIndex.json").read_text(encoding="utf-8"))
+    def test_stage1_empty_inputs(self, run_index):
+        idx = run_index
         stage1 = next(s for s in idx["stages"] if s["name"] == "stage1_generate_script")
         assert stage1["inputs"] == [], (
             "stage1_generate_script has no upstream artifacts and must have empty inputs"
         )
 
-    def test_relative_paths(self, tmp_path, mock_stage5):
-        _, run_dir = _run_full_pipeline(tmp_path)
-        idx = json.loads((run_dir / "RunIndex.json").read_text(encoding="utf-8"))
+    def test_relative_paths(self, run_index):
+        idx = run_index
         for stage in idx["stages"]:
             for entry in stage["inputs"] + stage["outputs"]:
                 assert not Path(entry["path"]).is_absolute(), (
                     f"Expected relative path but got absolute: {entry['path']}"
                 )
 
-    def test_sha256_correctness(self, tmp_path, mock_stage5):
-        _, run_dir = _run_full_pipeline(tmp_path)
-        idx = json.loads((run_dir / "RunIndex.json").read_text(encoding="utf-8"))
+    def test_sha256_correctness(self, tmp_path, baseline_run):
+        summary, run_dir = _copy_baseline(baseline_run, tmp_path)
+        idx = summary["run_index"]
         for stage in idx["stages"]:
             for entry in stage["outputs"]:
                 file_path = run_dir / entry["path"]
@@ -252,17 +286,25 @@ class TestWriteRunIndex:
             "RunIndex.json must not be written for a failed pipeline run"
         )
 
-    def test_run_id_deterministic(self, tmp_path, mock_stage5):
-        """The RunIndex run_id is stable across two runs with identical input files."""
-        _, run_dir = _run_full_pipeline(tmp_path)
-        idx1 = json.loads((run_dir / "RunIndex.json").read_text(encoding="utf-8"))
-
-        # Force re-run to regenerate RunIndex.json in-place
-        _run_full_pipeline(tmp_path, force=True)
-        idx2 = json.loads((run_dir / "RunIndex.json").read_text(encoding="utf-8"))
+    def test_run_id_is_input_digest(self, run_index, baseline_run):
+        """The RunIndex run_id is SHA-256 over the sorted, unique input-file digests.
 
-        assert idx1["run_id"] == idx2["run_id"], (
-            "RunIndex run_id must be deterministic for identical input files"
+        Each recorded input digest is checked against the file on disk, so the
+        run_id is tied to the input files' bytes and nothing else.
+        """
+        _, root = baseline_run
+        run_dir = root / PROJECT_CONFIG["id"] / compute_run_id(PROJECT_CONFIG)
+        input_shas: set[str] = set()
+        for stage in run_index["stages"]:
+            for inp in stage["inputs"]:
+                assert hash_file_bytes(run_dir / inp["path"]) == inp["sha256"], (
+                    f"recorded sha256 for input {inp['path']} does not match the file"
+                )
+                input_shas.add(inp["sha256"])
+        assert input_shas, "baseline run must record at least one input"
+        expected = hashlib.sha256("\n".join(sorted(input_shas)).encode("utf-8")).hexdigest()
+        assert run_index["run_id"] == expected, (
+            "RunIndex run_id must be derived only from the input file contents"
         )
 
 
@@ -271,133 +313,108 @@ class TestWriteRunIndex:
 # ===========================================================================
 
 class TestExplainCommand:
-    def _get_run_dir(self, tmp_path) -> Path:
-        """Run the full pipeline and return the run directory (stage5 must be mocked first)."""
-        _, run_dir = _run_full_pipeline(tmp_path)
-        return run_dir
-
-    def test_stage_names_present(self, tmp_path, mock_stage5):
-        run_dir = self._get_run_dir(tmp_path)
-        result = CliRunner().invoke(cli, ["explain", "--run", str(run_dir)])
+    def test_explain_output_structure(self, baseline_run):
+        """One read-only ``explain`` invocation on the session baseline, checked for
+        stage names, sha256 hashes, no timestamps, and an empty stage1 inputs list."""
+        _, root = baseline_run
+        run_dir = root / PROJECT_CONFIG["id"] / compute_run_id(PROJECT_CONFIG)
+        result = RUNNER.invoke(cli, ["explain", "--run", str(run_dir)])
         assert result.exit_code == 0
-        assert "stage1_generate_script" in result.output
-        assert "stage5_render_preview" in result.output
+        output = result.output
+
+        assert "stage1_generate_script" in output
+        assert "stage5_render_preview" in output
 
-    def test_no_timestamps(self, tmp_path, mock_stage5):
-        run_dir = self._get_run_dir(tmp_path)
-        result = CliRunner().invoke(cli, ["explain", "--run", str(run_dir)])
-        assert result.exit_code == 0
         # ISO-8601 datetime pattern: YYYY-MM-DDTHH:MM:SS
-        assert not re.search(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", result.output), (
+        assert not _ISO8601_RE.search(output), (
             "explain output must contain no timestamps"
         )
 
-    def test_exit_1_without_run_index(self, tmp_path):
-        run_dir = tmp_path / "empty_run"
-        run_dir.mkdir()
-        result = CliRunner().invoke(cli, ["explain", "--run", str(run_dir)])
-        assert result.exit_code == 1
-
-    def test_sha256_hashes_in_output(self, tmp_path, mock_stage5):
-        run_dir = self._get_run_dir(tmp_path)
-        result = CliRunner().invoke(cli, ["explain", "--run", str(run_dir)])
-        assert result.exit_code == 0
-        hex_hashes = re.findall(r"\b[0-9a-f]{64}\b", result.output)
+        hex_hashes = _SHA256_RE.findall(output)
         assert len(hex_hashes) > 0, "explain output must include at least one sha256 hash"
 
-    def test_stage1_inputs_empty(self, tmp_path, mock_stage5):
-        run_dir = self._get_run_dir(tmp_path)
-        result = CliRunner().invoke(cli, ["explain", "--run", str(run_dir)])
-        assert result.exit_code == 0
+        # stage1's inputs section: between the first "inputs:" and "outputs:" after its name
+        m = _STAGE1_INPUTS_RE.search(output)
+        assert m is not None, "explain output must list stage1 inputs and outputs"
+        inputs_section = m.group("inputs")
 
-        output = result.output
-        # Locate the stage1 block (everything between "Stage: stage1..." and next "Stage:")
-        stage1_start = output.index("stage1_generate_script")
-        rest = output[stage1_start + 1:]
-        next_stage_match = re.search(r"^Stage:", rest, re.MULTILINE)
-        stage1_block = rest[: next_stage_match.start()] if next_stage_match else rest
-
-        # The inputs section is everything between "inputs:" and "outputs:"
-        inputs_start = stage1_block.index("inputs:") + len("inputs:")
-        outputs_start = stage1_block.index("outputs:")
-        inputs_section = stage1_block[inputs_start:outputs_start]
-
-        assert not re.search(r"[0-9a-f]{64}", inputs_section), (
+        assert not _SHA256_RE.search(inputs_section), (
             "stage1_generate_script should have no sha256 hashes in its inputs section"
         )
 
+    def test_exit_1_without_run_index(self, tmp_path):
+        run_dir = tmp_path  # empty: no RunIndex.json
+        result = RUNNER.invoke(cli, ["explain", "--run", str(run_dir)])
+        assert result.exit_code == 1
+        assert "Error: RunIndex.json not found in" in result.stderr
 
 # ===========================================================================
 # TestReplayCommand
 # ===========================================================================
 
 class TestReplayCommand:
-    def _setup_run(self, tmp_path: Path) -> Path:
-        """Run the pipeline with a real project.json and return the run directory.
-        Stage5 must be mocked by the calling test via mock_stage5 fixture.
+    def _setup_run(self, baseline_run, tmp_path: Path) -> Path:
+        """Copy the session baseline run next to a real project.json; return the run directory.
+
+        replay rebuilds the PipelineRunner from run_summary.json, so its
+        project_path is pointed at this test's project.json.  Stage5 must be
+        mocked by the calling test via mock_stage5 fixture (replay may re-run it).
         """
         project_file = tmp_path / "project.json"
-        project_file.write_text(json.dumps(PROJECT_CONFIG), encoding="utf-8")
-        _, run_dir = _run_full_pipeline(tmp_path, project_path=str(project_file))
+        project_file.write_bytes(_PROJECT_JSON_BYTES)
+        _, run_dir = _copy_baseline(baseline_run, tmp_path)
+        summary_file = run_dir / "run_summary.json"
+        run_summary = json.loads(summary_file.read_bytes())
+        run_summary["project_path"] = str(project_file)
+        summary_file.write_text(json.dumps(run_summary, indent=2), encoding="utf-8")
         return run_dir
 
-    def test_noop_when_all_valid(self, tmp_path, mock_stage5):
+    def test_noop_when_all_valid(self, tmp_path, baseline_run, mock_stage5, capsys):
         """replay exits 0 and reports success when all outputs are valid."""
-        run_dir = self._setup_run(tmp_path)
-        result = CliRunner().invoke(cli, ["replay", "--run", str(run_dir)])
-        assert result.exit_code == 0, result.output
-        assert "completed" in result.output.lower()
-
-    def test_detects_mismatch_and_reruns(self, tmp_path, mock_stage5):
-        """replay detects a hash mismatch and re-runs the affected stage."""
-        run_dir = self._setup_run(tmp_path)
+        run_dir = self._setup_run(baseline_run, tmp_path)
+        exit_code = run_replay(run_dir)
+        out = capsys.readouterr().out
+        assert exit_code == 0, out
+        assert "completed" in out.lower()
+
+    def test_detects_mismatch_and_reruns(self, tmp_path, baseline_run, mock_stage5, capsys):
+        """replay detects a hash mismatch, removes the corrupted artifact and re-runs its stage."""
+        run_dir = self._setup_run(baseline_run, tmp_path)
         # Corrupt ShotList.json by appending whitespace (still valid JSON)
         corrupt_file = run_dir / "ShotList.json"
-        with open(corrupt_file, "ab") as fh:
-            fh.write(b" ")
-        result = CliRunner().invoke(cli, ["replay", "--run", str(run_dir)])
-        assert result.exit_code == 0, result.output
-        assert "Hash mismatch" in result.output
-        assert "ShotList.json" in result.output
+        meta_file = run_dir / "ShotList.meta.json"
+        _append_byte(corrupt_file)
+        exit_code = run_replay(run_dir)
+        out = capsys.readouterr().out
+        assert exit_code == 0, out
+        assert "Hash mismatch" in out
+        assert "ShotList.json" in out
+        # File and meta should have been re-created by the re-run stage
+        assert corrupt_file.exists(), "ShotList.json should be re-created after replay"
+        assert meta_file.exists(), "ShotList.meta.json should be re-created after replay"
 
     def test_exit_1_without_run_index(self, tmp_path):
-        run_dir = tmp_path / "empty_run"
-        run_dir.mkdir()
-        result = CliRunner().invoke(cli, ["replay", "--run", str(run_dir)])
+        run_dir = tmp_path  # empty: no RunIndex.json
+        result = RUNNER.invoke(cli, ["replay", "--run", str(run_dir)])
         assert result.exit_code == 1
+        assert "Error: RunIndex.json not found in" in result.stderr
 
-    def test_never_overwrites_valid_outputs(self, tmp_path, mock_stage5):
+    def test_never_overwrites_valid_outputs(self, tmp_path, baseline_run, mock_stage5, capsys):
         """Replay must not rewrite files whose hashes are still valid."""
-        run_dir = self._setup_run(tmp_path)
+        run_dir = self._setup_run(baseline_run, tmp_path)
         script_file = run_dir / "Script.json"
-        original_mtime_ns = script_file.stat().st_mtime_ns
-
-        # Brief pause so that any re-write would produce a detectably newer mtime
-        time.sleep(0.05)
-
-        result = CliRunner().invoke(cli, ["replay", "--run", str(run_dir)])
-        assert result.exit_code == 0, result.output
-        assert script_file.stat().st_mtime_ns == original_mtime_ns, (
+        # Pin mtime to the epoch: any rewrite by replay stamps the current time,
+        # so the sentinel is known without a stat before the call.
+        sentinel = 0
+        os.utime(script_file, ns=(sentinel, sentinel))
+
+        exit_code = run_replay(run_dir)
+        assert exit_code == 0, capsys.readouterr().out
+        st = os.stat(script_file)
+        assert st.st_mtime_ns == sentinel, (
             "Script.json must not be rewritten when its hash is still valid"
         )
 
-    def test_removes_corrupted_file_and_meta(self, tmp_path, mock_stage5):
-        """replay deletes a corrupted artifact and its .meta.json before re-running."""
-        run_dir = self._setup_run(tmp_path)
-        corrupt_file = run_dir / "ShotList.json"
-        meta_file = run_dir / "ShotList.meta.json"
-
-        # Corrupt the file
-        with open(corrupt_file, "ab") as fh:
-            fh.write(b" ")
-
-        result = CliRunner().invoke(cli, ["replay", "--run", str(run_dir)])
-        assert result.exit_code == 0, result.output
-
-        # File should have been re-created by the re-run stage
-        assert corrupt_file.exists(), "ShotList.json should be re-created after replay"
-        assert meta_file.exists(), "ShotList.meta.json should be re-created after replay"
-
 
 # ===========================================================================
 # TestWave2
@@ -408,13 +425,13 @@ _CANON_DECISION: dict = {
     "schema_id": "CanonDecision",
     "decision_id": "test-canon-01",
 }
+_CANON_DECISION_BYTES = json.dumps(_CANON_DECISION).encode()
 
 
 class TestWave2:
-    def test_schema_version_in_entries(self, tmp_path, mock_stage5):
+    def test_schema_version_in_entries(self, run_index):
         """Every output entry in RunIndex has schema_version == '1.0.0'."""
-        _, run_dir = _run_full_pipeline(tmp_path)
-        idx = json.loads((run_dir / "RunIndex.json").read_text(encoding="utf-8"))
+        idx = run_index
         for stage in idx["stages"]:
             for entry in stage["outputs"]:
                 assert "schema_version" in entry, (
@@ -425,10 +442,9 @@ class TestWave2:
                     f"got {entry['schema_version']!r}"
                 )
 
-    def test_no_schema_id_for_regular_artifacts(self, tmp_path, mock_stage5):
+    def test_no_schema_id_for_regular_artifacts(self, run_index):
         """Regular artifacts now carry schema_id; verify it IS present in their entries."""
-        _, run_dir = _run_full_pipeline(tmp_path)
-        idx = json.loads((run_dir / "RunIndex.json").read_text(encoding="utf-8"))
+        idx = run_index
         for stage in idx["stages"]:
             for entry in stage["outputs"]:
                 # Skip CanonDecision.json which has its own schema_id
@@ -450,11 +466,11 @@ class TestWave2:
         pre_run_dir = tmp_path / PROJECT_CONFIG["id"] / run_id
         pre_run_dir.mkdir(parents=True, exist_ok=True)
         canon_file = pre_run_dir / "CanonDecision.json"
-        canon_file.write_text(json.dumps(_CANON_DECISION), encoding="utf-8")
+        canon_file.write_bytes(_CANON_DECISION_BYTES)
         expected_sha = hash_file_bytes(canon_file)
 
         _, run_dir = _run_full_pipeline(tmp_path)
-        idx = json.loads((run_dir / "RunIndex.json").read_text(encoding="utf-8"))
+        idx = json.loads((run_dir / "RunIndex.json").read_bytes())
         stage1 = next(s for s in idx["stages"] if s["name"] == "stage1_generate_script")
         canon_entries = [e for e in stage1["outputs"] if "CanonDecision" in e["path"]]
         assert len(canon_entries) == 1, (
@@ -470,15 +486,14 @@ class TestWave2:
         run_id = compute_run_id(PROJECT_CONFIG)
         pre_run_dir = tmp_path / PROJECT_CONFIG["id"] / run_id
         pre_run_dir.mkdir(parents=True, exist_ok=True)
-        (pre_run_dir / "CanonDecision.json").write_text(
-            json.dumps(_CANON_DECISION), encoding="utf-8"
-        )
+        (pre_run_dir / "CanonDecision.json").write_bytes(_CANON_DECISION_BYTES)
 
         _, run_dir = _run_full_pipeline(tmp_path)
-        bytes1 = (run_dir / "RunIndex.json").read_bytes()
+        idx_path = run_dir / "RunIndex.json"
+        bytes1 = idx_path.read_bytes()
 
         _run_full_pipeline(tmp_path, force=True)
-        bytes2 = (run_dir / "RunIndex.json").read_bytes()
+        bytes2 = idx_path.read_bytes()
 
         assert bytes1 == bytes2, (
             "RunIndex.json must be byte-identical across two identical runs"
@@ -486,8 +501,7 @@ class TestWave2:
 
     def test_warning_on_missing_schema_metadata(self, tmp_path, capsys):
         """_enforce_schema_metadata raises _SchemaMissingError and prints ERROR for bare JSON."""
-        run_dir = tmp_path / "enforce_run"
-        run_dir.mkdir()
+        run_dir = tmp_path
         bare_file = run_dir / "Bare.json"
         bare_file.write_text('{"some_field": "value"}', encoding="utf-8")
 
@@ -500,14 +514,14 @@ class TestWave2:
 # ===========================================================================
 
 class TestWave3:
-    def test_happy_path_with_allow(self, tmp_path, mock_stage5):
+    def test_happy_path_with_allow(self, tmp_path, baseline_run):
         """Pipeline completes when CanonDecision.json has decision='allow'."""
-        # _run_full_pipeline places _CANON_ALLOW by default (no pre-write needed)
-        summary, run_dir = _run_full_pipeline(tmp_path)
+        # The baseline run used _run_full_pipeline's default _CANON_ALLOW
+        summary, run_dir = _copy_baseline(baseline_run, tmp_path)
 
         assert summary["status"] == "completed"
         assert (run_dir / "RunIndex.json").exists()
-        idx = json.loads((run_dir / "RunIndex.json").read_text(encoding="utf-8"))
+        idx = json.loads((run_dir / "RunIndex.json").read_bytes())
         assert "failure_reason" not in idx
         assert "status" not in idx  # optional field only present on failure
 
@@ -516,9 +530,7 @@ class TestWave3:
         run_id = compute_run_id(PROJECT_CONFIG)
         run_dir = tmp_path / PROJECT_CONFIG["id"] / run_id
         run_dir.mkdir(parents=True, exist_ok=True)
-        (run_dir / "CanonDecision.json").write_text(
-            json.dumps(_CANON_DENY), encoding="utf-8"
-        )
+        (run_dir / "CanonDecision.json").write_bytes(_CANON_DENY_BYTES)
 
         stage5_mock = MagicMock(side_effect=AssertionError("renderer must not run"))
         with patch("orchestrator.stages.stage5_render_preview.run", stage5_mock):
@@ -536,7 +548,7 @@ class TestWave3:
         assert (run_dir / "RunIndex.json").exists(), (
             "RunIndex.json must be written even on continuation_rejected"
         )
-        idx = json.loads((run_dir / "RunIndex.json").read_text(encoding="utf-8"))
+        idx = json.loads((run_dir / "RunIndex.json").read_bytes())
         assert idx.get("status") == "failed"
         assert idx.get("failure_reason") == "continuation_rejected"
 
@@ -587,8 +599,7 @@ class TestWave3:
 
     def test_enforce_schema_unit(self, tmp_path, capsys):
         """_enforce_schema_metadata raises _SchemaMissingError on bare JSON."""
-        run_dir = tmp_path / "unit_run"
-        run_dir.mkdir()
+        run_dir = tmp_path
         bare_file = run_dir / "Artifact.json"
         bare_file.write_text('{"data": "no schema fields here"}', encoding="utf-8")
 
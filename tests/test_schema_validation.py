@@ -1,6 +1,7 @@
 """Tests for artifact schema validation (all 5 artifact types)."""
 
 import json
+
 import pytest
 import jsonschema
 
@@ -8,11 +9,12 @@ from orchestrator.validator import ARTIFACT_SCHEMAS, SCHEMAS_DIR, validate_artif
 
 
 # ---------------------------------------------------------------------------
-# Fixture factories
+# Fixtures — a fresh dict per test, so tests may edit them in place.
 # ---------------------------------------------------------------------------
 
 
-def make_valid_script() -> dict:
+@pytest.fixture
+def valid_script() -> dict:
     return {
         "schema_id": "Script",
         "schema_version": "1.0.0",
@@ -30,7 +32,8 @@ def make_valid_script() -> dict:
     }
 
 
-def make_valid_shotlist() -> dict:
+@pytest.fixture
+def valid_shotlist() -> dict:
     return {
         "schema_id": "ShotList",
         "schema_version": "1.0.0",
@@ -57,7 +60,8 @@ def make_valid_shotlist() -> dict:
     }
 
 
-def make_valid_asset_manifest() -> dict:
+@pytest.fixture
+def valid_asset_manifest() -> dict:
     return {
         "schema_id": "AssetManifest_draft",
         "schema_version": "1.0.0",
@@ -78,7 +82,8 @@ def make_valid_asset_manifest() -> dict:
     }
 
 
-def make_valid_asset_manifest_media() -> dict:
+@pytest.fixture
+def valid_asset_manifest_media() -> dict:
     return {
         "schema_id": "AssetManifest.media",
         "schema_version": "1.0.0",
@@ -107,7 +112,8 @@ def make_valid_asset_manifest_media() -> dict:
     }
 
 
-def make_valid_render_plan() -> dict:
+@pytest.fixture
+def valid_render_plan() -> dict:
     return {
         "schema_id": "RenderPlan",
         "schema_version": "1.0.0",
@@ -131,7 +137,8 @@ def make_valid_render_plan() -> dict:
     }
 
 
-def make_valid_render_output() -> dict:
+@pytest.fixture
+def valid_render_output() -> dict:
     return {
         "schema_id": "RenderOutput",
         "schema_version": "1.0.0",
@@ -151,26 +158,14 @@ def make_valid_render_output() -> dict:
 
 
 class TestScript:
-    def test_valid_script(self):
-        validate_artifact(make_valid_script(), "Script")  # no exception
-
-    def test_invalid_script_missing_title(self):
-        data = make_valid_script()
-        del data["title"]
-        with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "Script")
-
-    def test_invalid_script_missing_scenes(self):
-        data = make_valid_script()
-        del data["scenes"]
-        with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "Script")
+    def test_valid_script(self, valid_script):
+        validate_artifact(valid_script, "Script")  # no exception
 
-    def test_invalid_script_missing_schema_version(self):
-        data = make_valid_script()
-        del data["schema_version"]
+    @pytest.mark.parametrize("missing", ["title", "scenes", "schema_version"])
+    def test_invalid_missing_required(self, missing, valid_script):
+        del valid_script[missing]
         with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "Script")
+            validate_artifact(valid_script, "Script")
 
 
 # ---------------------------------------------------------------------------
@@ -179,32 +174,16 @@ class TestScript:
 
 
 class TestShotList:
-    def test_valid_shotlist(self):
-        validate_artifact(make_valid_shotlist(), "ShotList")
-
-    def test_invalid_shotlist_missing_timing_lock_hash(self):
-        data = make_valid_shotlist()
-        del data["timing_lock_hash"]
+    def test_valid_shotlist(self, valid_shotlist):
+        validate_artifact(valid_shotlist, "ShotList")
+
+    @pytest.mark.parametrize(
+        "missing", ["timing_lock_hash", "shotlist_id", "created_at", "total_duration_sec"]
+    )
+    def test_invalid_missing_required(self, missing, valid_shotlist):
+        del valid_shotlist[missing]
         with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "ShotList")
-
-    def test_invalid_shotlist_missing_required(self):
-        data = make_valid_shotlist()
-        del data["shotlist_id"]
-        with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "ShotList")
-
-    def test_invalid_shotlist_missing_created_at(self):
-        data = make_valid_shotlist()
-        del data["created_at"]
-        with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "ShotList")
-
-    def test_invalid_shotlist_missing_total_duration_sec(self):
-        data = make_valid_shotlist()
-        del data["total_duration_sec"]
-        with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "ShotList")
+            validate_artifact(valid_shotlist, "ShotList")
 
 
 # ---------------------------------------------------------------------------
@@ -213,55 +192,49 @@ class TestShotList:
 
 
 class TestAssetManifest:
-    def test_valid_asset_manifest(self):
-        validate_artifact(make_valid_asset_manifest(), "AssetManifest_draft")
-
-    def test_invalid_asset_manifest_missing_shotlist_ref(self):
-        data = make_valid_asset_manifest()
-        del data["shotlist_ref"]
-        with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "AssetManifest_draft")
+    def test_valid_asset_manifest(self, valid_asset_manifest):
+        validate_artifact(valid_asset_manifest, "AssetManifest_draft")
 
-    def test_invalid_asset_manifest_missing_required(self):
-        data = make_valid_asset_manifest()
-        del data["manifest_id"]
+    @pytest.mark.parametrize("missing", ["shotlist_ref", "manifest_id"])
+    def test_invalid_missing_required(self, missing, valid_asset_manifest):
+        del valid_asset_manifest[missing]
         with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "AssetManifest_draft")
+            validate_artifact(valid_asset_manifest, "AssetManifest_draft")
 
-    def test_character_pack_with_asset_id_and_license_type_is_valid(self):
-        data = make_valid_asset_manifest()
+    def test_character_pack_with_asset_id_and_license_type_is_valid(self, valid_asset_manifest):
+        data = valid_asset_manifest
         data["character_packs"] = [
             {"asset_id": "char-hero", "license_type": "proprietary_cleared"}
         ]
         validate_artifact(data, "AssetManifest_draft")
 
-    def test_character_pack_missing_asset_id_is_invalid(self):
-        data = make_valid_asset_manifest()
+    def test_character_pack_missing_asset_id_is_invalid(self, valid_asset_manifest):
+        data = valid_asset_manifest
         data["character_packs"] = [{"license_type": "proprietary_cleared"}]
         with pytest.raises(jsonschema.ValidationError):
             validate_artifact(data, "AssetManifest_draft")
 
-    def test_character_pack_missing_license_type_is_invalid(self):
-        data = make_valid_asset_manifest()
+    def test_character_pack_missing_license_type_is_invalid(self, valid_asset_manifest):
+        data = valid_asset_manifest
         data["character_packs"] = [{"asset_id": "char-hero"}]
         with pytest.raises(jsonschema.ValidationError):
             validate_artifact(data, "AssetManifest_draft")
 
-    def test_background_with_asset_id_and_license_type_is_valid(self):
-        data = make_valid_asset_manifest()
+    def test_background_with_asset_id_and_license_type_is_valid(self, valid_asset_manifest):
+        data = valid_asset_manifest
         data["backgrounds"] = [
             {"asset_id": "bg-scene-001", "license_type": "proprietary_cleared"}
         ]
         validate_artifact(data, "AssetManifest_draft")
 
-    def test_background_missing_asset_id_is_invalid(self):
-        data = make_valid_asset_manifest()
+    def test_background_missing_asset_id_is_invalid(self, valid_asset_manifest):
+        data = valid_asset_manifest
         data["backgrounds"] = [{"license_type": "proprietary_cleared"}]
         with pytest.raises(jsonschema.ValidationError):
             validate_artifact(data, "AssetManifest_draft")
 
-    def test_background_missing_license_type_is_invalid(self):
-        data = make_valid_asset_manifest()
+    def test_background_missing_license_type_is_invalid(self, valid_asset_manifest):
+        data = valid_asset_manifest
         data["backgrounds"] = [{"asset_id": "bg-scene-001"}]
         with pytest.raises(jsonschema.ValidationError):
             validate_artifact(data, "AssetManifest_draft")
@@ -273,41 +246,41 @@ class TestAssetManifest:
 
 
 class TestAssetManifestMedia:
-    def test_valid_asset_manifest_media(self):
+    def test_valid_asset_manifest_media(self, valid_asset_manifest_media):
         """A fully valid AssetManifest.media document passes schema validation."""
-        validate_artifact(make_valid_asset_manifest_media(), "AssetManifest.media")
+        validate_artifact(valid_asset_manifest_media, "AssetManifest.media")
 
-    def test_http_uri_rejected(self):
+    def test_http_uri_rejected(self, valid_asset_manifest_media):
         """HTTP/HTTPS URIs are explicitly disallowed by the schema pattern."""
-        data = make_valid_asset_manifest_media()
+        data = valid_asset_manifest_media
         data["items"][0]["uri"] = "https://example.com/asset.png"
         with pytest.raises(jsonschema.ValidationError):
             validate_artifact(data, "AssetManifest.media")
 
-    def test_bad_asset_type_enum(self):
+    def test_bad_asset_type_enum(self, valid_asset_manifest_media):
         """asset_type must be one of the enum values."""
-        data = make_valid_asset_manifest_media()
+        data = valid_asset_manifest_media
         data["items"][0]["asset_type"] = "unknown_type"
         with pytest.raises(jsonschema.ValidationError):
             validate_artifact(data, "AssetManifest.media")
 
-    def test_missing_retrieval_date(self):
+    def test_missing_retrieval_date(self, valid_asset_manifest_media):
         """metadata.retrieval_date is required."""
-        data = make_valid_asset_manifest_media()
+        data = valid_asset_manifest_media
         del data["items"][0]["metadata"]["retrieval_date"]
         with pytest.raises(jsonschema.ValidationError):
             validate_artifact(data, "AssetManifest.media")
 
-    def test_missing_producer_on_item(self):
+    def test_missing_producer_on_item(self, valid_asset_manifest_media):
         """Each item must have a producer field."""
-        data = make_valid_asset_manifest_media()
+        data = valid_asset_manifest_media
         del data["items"][0]["producer"]
         with pytest.raises(jsonschema.ValidationError):
             validate_artifact(data, "AssetManifest.media")
 
-    def test_missing_license_on_item(self):
+    def test_missing_license_on_item(self, valid_asset_manifest_media):
         """Each item must have a license field."""
-        data = make_valid_asset_manifest_media()
+        data = valid_asset_manifest_media
         del data["items"][0]["license"]
         with pytest.raises(jsonschema.ValidationError):
             validate_artifact(data, "AssetManifest.media")
@@ -319,27 +292,21 @@ class TestAssetManifestMedia:
 
 
 class TestRenderPlan:
-    def test_valid_render_plan(self):
-        validate_artifact(make_valid_render_plan(), "RenderPlan")
+    def test_valid_render_plan(self, valid_render_plan):
+        validate_artifact(valid_render_plan, "RenderPlan")
 
-    def test_invalid_renderplan_bad_profile(self):
+    def test_invalid_renderplan_bad_profile(self, valid_render_plan):
         """Profile must be one of the enum values."""
-        data = make_valid_render_plan()
+        data = valid_render_plan
         data["profile"] = "ultra_hd_invalid"
         with pytest.raises(jsonschema.ValidationError):
             validate_artifact(data, "RenderPlan")
 
-    def test_invalid_render_plan_missing_manifest_ref(self):
-        data = make_valid_render_plan()
-        del data["manifest_ref"]
-        with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "RenderPlan")
-
-    def test_invalid_render_plan_missing_required(self):
-        data = make_valid_render_plan()
-        del data["plan_id"]
+    @pytest.mark.parametrize("missing", ["manifest_ref", "plan_id"])
+    def test_invalid_missing_required(self, missing, valid_render_plan):
+        del valid_render_plan[missing]
         with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "RenderPlan")
+            validate_artifact(valid_render_plan, "RenderPlan")
 
 
 # ---------------------------------------------------------------------------
@@ -348,20 +315,14 @@ class TestRenderPlan:
 
 
 class TestRenderOutput:
-    def test_valid_render_output(self):
-        validate_artifact(make_valid_render_output(), "RenderOutput")
-
-    def test_invalid_render_output_missing_video_uri(self):
-        data = make_valid_render_output()
-        del data["video_uri"]
-        with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "RenderOutput")
+    def test_valid_render_output(self, valid_render_output):
+        validate_artifact(valid_render_output, "RenderOutput")
 
-    def test_invalid_render_output_missing_required(self):
-        data = make_valid_render_output()
-        del data["output_id"]
+    @pytest.mark.parametrize("missing", ["video_uri", "output_id"])
+    def test_invalid_missing_required(self, missing, valid_render_output):
+        del valid_render_output[missing]
         with pytest.raises(jsonschema.ValidationError):
-            validate_artifact(data, "RenderOutput")
+            validate_artifact(valid_render_output, "RenderOutput")
 
 
 # ---------------------------------------------------------------------------
@@ -395,3 +356,29 @@ def test_pipeline_required_fields_in_all_schemas() -> None:
         assert "schema_version" in required, (
             f"{artifact_type}: 'schema_version' missing from required"
         )
+
+
+def test_validator_compiled_once_per_type(valid_script) -> None:
+    """Repeated validations reuse one cached validator per artifact type."""
+    from orchestrator.validator import _get_validator
+
+    validate_artifact(valid_script, "Script")
+    first = _get_validator("Script")
+    validate_artifact(valid_script, "Script")
+    assert _get_validator("Script") is first
+
+
+def test_validator_hot_loop_never_recompiles(valid_script, monkeypatch) -> None:
+    """Once warm, 1000 validations compile nothing (regression guard for the cache)."""
+    from orchestrator.validator import _get_validator
+
+    validate_artifact(valid_script, "Script")
+
+    def _no_compile(*args, **kwargs):
+        raise AssertionError("validator recompiled on the hot path")
+
+    # check_schema runs exactly once per compile in _get_validator.
+    cls = type(_get_validator("Script"))
+    monkeypatch.setattr(cls, "check_schema", classmethod(_no_compile))
+    for _ in range(1000):
+        validate_artifact(valid_script, "Script")
@@ -11,6 +11,7 @@ Covers:
 """
 
 import json
+import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -43,11 +44,8 @@ _RUN_ID = "run-abc12345"
 _WE_BIN = MagicMock()
 
 
-def _make_we_result(returncode: int, stderr: str = "") -> MagicMock:
-    m = MagicMock()
-    m.returncode = returncode
-    m.stderr = stderr
-    return m
+def _make_we_result(returncode: int, stderr: str = "") -> subprocess.CompletedProcess:
+    return subprocess.CompletedProcess(args=[], returncode=returncode, stdout="", stderr=stderr)
 
 
 # ---------------------------------------------------------------------------
@@ -8,8 +8,9 @@ specifies '--out'.  These tests patch call_agent to capture args without
 actually running world-engine.
 """
 
+import subprocess
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
@@ -41,11 +42,8 @@ _MINIMAL_SCRIPT = {
 }
 
 
-def _make_result(returncode: int) -> MagicMock:
-    m = MagicMock()
-    m.returncode = returncode
-    m.stderr = ""
-    return m
+def _make_result(returncode: int) -> subprocess.CompletedProcess:
+    return subprocess.CompletedProcess(args=[], returncode=returncode, stdout="", stderr="")
 
 
 def _setup_registry(tmp_path: Path) -> ArtifactRegistry:
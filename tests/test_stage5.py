@@ -1,6 +1,7 @@
 """Tests for stage5_render_preview — video CLI interface, file-based output, placeholder fallback."""
 
 import json
+import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -14,12 +15,9 @@ from orchestrator.stages import stage5_render_preview
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_call_agent_result(returncode: int, stderr: str = "") -> MagicMock:
-    """Return a MagicMock that looks like a CompletedProcess from call_agent."""
-    m = MagicMock()
-    m.returncode = returncode
-    m.stderr     = stderr
-    return m
+def _make_call_agent_result(returncode: int, stderr: str = "") -> subprocess.CompletedProcess:
+    """Return the CompletedProcess call_agent would hand back (text mode)."""
+    return subprocess.CompletedProcess(args=[], returncode=returncode, stdout="", stderr=stderr)
 
 
 def _minimal_ro(
@@ -40,6 +38,10 @@ def _minimal_ro(
     }
 
 
+# Default (https://) RenderOutput as written by the renderer, encoded once.
+_RO_HTTPS_BYTES = json.dumps(_minimal_ro()).encode()
+
+
 def _write_minimal_artifacts(registry: ArtifactRegistry, pid: str, run_id: str) -> None:
     """Write AssetManifest_final and RenderPlan so registry paths exist.
 
@@ -51,25 +53,25 @@ def _write_minimal_artifacts(registry: ArtifactRegistry, pid: str, run_id: str)
     rp = {"resolved_assets": [{"asset_id": "test-asset", "asset_type": "vo",
                                 "uri": "file:///tmp/test.mp4", "is_placeholder": False,
                                 "license_type": "cc0"}]}
-    registry.artifact_path(pid, run_id, "RenderPlan").write_text(
-        json.dumps(rp), encoding="utf-8"
-    )
-    registry.artifact_path(pid, run_id, "AssetManifest_final").write_text(
-        "{}", encoding="utf-8"
+    registry.artifact_path(pid, run_id, "RenderPlan").write_bytes(
+        json.dumps(rp).encode()
     )
+    registry.artifact_path(pid, run_id, "AssetManifest_final").write_bytes(b"{}")
 
 
 # Non-None sentinel: returned by find_agent_bin when the binary is "installed".
 _VIDEO_BIN = MagicMock()
 
 
-def _make_write_ro_side_effect(ro: dict, ok_result: MagicMock):
-    """Return a call_agent side-effect that writes ro to the --out path on disk."""
+def _make_write_ro_side_effect(ro: dict, ok_result: subprocess.CompletedProcess):
+    """Return a call_agent stand-in that writes ro to the --out path on disk."""
+    payload = json.dumps(ro).encode()
+
     def _side_effect(name, args, **kwargs):
         out_idx = args.index("--out") + 1
         out_path = Path(args[out_idx])
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(json.dumps(ro), encoding="utf-8")
+        out_path.write_bytes(payload)
         return ok_result
     return _side_effect
 
@@ -106,23 +108,19 @@ class TestAllPlaceholderRenderPlan:
                 },
             ]
         }
-        registry.artifact_path(pid, run_id, "RenderPlan").write_text(
-            json.dumps(rp), encoding="utf-8"
-        )
-        registry.artifact_path(pid, run_id, "AssetManifest_final").write_text(
-            "{}", encoding="utf-8"
+        registry.artifact_path(pid, run_id, "RenderPlan").write_bytes(
+            json.dumps(rp).encode()
         )
+        registry.artifact_path(pid, run_id, "AssetManifest_final").write_bytes(b"{}")
 
     def _write_empty_plan(self, registry: ArtifactRegistry, pid: str, run_id: str) -> None:
         """Write a RenderPlan with an empty resolved_assets list."""
         run_dir = registry.run_dir(pid, run_id)
         run_dir.mkdir(parents=True, exist_ok=True)
-        registry.artifact_path(pid, run_id, "RenderPlan").write_text(
-            json.dumps({"resolved_assets": []}), encoding="utf-8"
-        )
-        registry.artifact_path(pid, run_id, "AssetManifest_final").write_text(
-            "{}", encoding="utf-8"
+        registry.artifact_path(pid, run_id, "RenderPlan").write_bytes(
+            json.dumps({"resolved_assets": []}).encode()
         )
+        registry.artifact_path(pid, run_id, "AssetManifest_final").write_bytes(b"{}")
 
     def test_all_placeholder_returns_placeholder_stub(self, tmp_path):
         """All resolved assets placeholder → placeholder RenderOutput returned."""
@@ -205,12 +203,10 @@ class TestAllPlaceholderRenderPlan:
                  "uri": "placeholder://character/a", "is_placeholder": True, "license_type": "cc0"},
             ]
         }
-        registry.artifact_path(pid, run_id, "RenderPlan").write_text(
-            json.dumps(rp), encoding="utf-8"
-        )
-        registry.artifact_path(pid, run_id, "AssetManifest_final").write_text(
-            "{}", encoding="utf-8"
+        registry.artifact_path(pid, run_id, "RenderPlan").write_bytes(
+            json.dumps(rp).encode()
         )
+        registry.artifact_path(pid, run_id, "AssetManifest_final").write_bytes(b"{}")
 
         with patch(
             "orchestrator.stages.stage5_render_preview.find_agent_bin",
@@ -261,27 +257,27 @@ class TestVideoNotInstalled:
 # ---------------------------------------------------------------------------
 
 class TestRendererNonZeroExit:
-    def test_nonzero_exit_raises_runtime_error(self, tmp_path):
+    def test_nonzero_exit_raises_runtime_error(self, tmp_path, monkeypatch):
         pid, run_id = "p", "r1"
         registry = ArtifactRegistry(tmp_path)
         _write_minimal_artifacts(registry, pid, run_id)
         bad = _make_call_agent_result(1, "fatal: something went wrong")
+        monkeypatch.setattr(stage5_render_preview, "call_agent", lambda *a, **kw: bad)
+        monkeypatch.setattr(stage5_render_preview, "find_agent_bin", lambda name: _VIDEO_BIN)
 
-        with patch("orchestrator.stages.stage5_render_preview.find_agent_bin", return_value=_VIDEO_BIN):
-            with patch("orchestrator.stages.stage5_render_preview.call_agent", return_value=bad):
-                with pytest.raises(RuntimeError, match="code 1"):
-                    stage5_render_preview.run({"id": pid}, run_id, registry)
+        with pytest.raises(RuntimeError, match="code 1"):
+            stage5_render_preview.run({"id": pid}, run_id, registry)
 
-    def test_runtime_error_includes_stderr(self, tmp_path):
+    def test_runtime_error_includes_stderr(self, tmp_path, monkeypatch):
         pid, run_id = "p", "r1"
         registry = ArtifactRegistry(tmp_path)
         _write_minimal_artifacts(registry, pid, run_id)
         bad = _make_call_agent_result(2, "my detailed error message")
+        monkeypatch.setattr(stage5_render_preview, "call_agent", lambda *a, **kw: bad)
+        monkeypatch.setattr(stage5_render_preview, "find_agent_bin", lambda name: _VIDEO_BIN)
 
-        with patch("orchestrator.stages.stage5_render_preview.find_agent_bin", return_value=_VIDEO_BIN):
-            with patch("orchestrator.stages.stage5_render_preview.call_agent", return_value=bad):
-                with pytest.raises(RuntimeError, match="my detailed error message"):
-                    stage5_render_preview.run({"id": pid}, run_id, registry)
+        with pytest.raises(RuntimeError, match="my detailed error message"):
+            stage5_render_preview.run({"id": pid}, run_id, registry)
 
 
 # ---------------------------------------------------------------------------
@@ -289,17 +285,17 @@ class TestRendererNonZeroExit:
 # ---------------------------------------------------------------------------
 
 class TestRenderOutputNotWritten:
-    def test_missing_render_output_raises_value_error(self, tmp_path):
+    def test_missing_render_output_raises_value_error(self, tmp_path, monkeypatch):
         """`video render` exits 0 but does not write RenderOutput.json → ValueError."""
         pid, run_id = "p", "r1"
         registry = ArtifactRegistry(tmp_path)
         _write_minimal_artifacts(registry, pid, run_id)
         ok = _make_call_agent_result(0)
+        monkeypatch.setattr(stage5_render_preview, "call_agent", lambda *a, **kw: ok)
+        monkeypatch.setattr(stage5_render_preview, "find_agent_bin", lambda name: _VIDEO_BIN)
 
-        with patch("orchestrator.stages.stage5_render_preview.find_agent_bin", return_value=_VIDEO_BIN):
-            with patch("orchestrator.stages.stage5_render_preview.call_agent", return_value=ok):
-                with pytest.raises(ValueError, match="RenderOutput.json"):
-                    stage5_render_preview.run({"id": pid}, run_id, registry)
+        with pytest.raises(ValueError, match="RenderOutput.json"):
+            stage5_render_preview.run({"id": pid}, run_id, registry)
 
 
 # ---------------------------------------------------------------------------
@@ -307,29 +303,28 @@ class TestRenderOutputNotWritten:
 # ---------------------------------------------------------------------------
 
 class TestFileUriMissing:
-    def _run_with_ro(self, tmp_path, ro: dict) -> None:
-        """Helper: mock call_agent to write ro to the expected --out path."""
+    def _run_with_ro(self, tmp_path, monkeypatch, ro: dict) -> None:
+        """Helper: patch call_agent to write ro to the expected --out path."""
         pid, run_id = "p", "r1"
         registry = ArtifactRegistry(tmp_path)
         _write_minimal_artifacts(registry, pid, run_id)
         ok = _make_call_agent_result(0)
+        monkeypatch.setattr(
+            stage5_render_preview, "call_agent", _make_write_ro_side_effect(ro, ok),
+        )
+        monkeypatch.setattr(stage5_render_preview, "find_agent_bin", lambda name: _VIDEO_BIN)
 
-        with patch("orchestrator.stages.stage5_render_preview.find_agent_bin", return_value=_VIDEO_BIN):
-            with patch(
-                "orchestrator.stages.stage5_render_preview.call_agent",
-                side_effect=_make_write_ro_side_effect(ro, ok),
-            ):
-                stage5_render_preview.run({"id": pid}, run_id, registry)
+        stage5_render_preview.run({"id": pid}, run_id, registry)
 
-    def test_video_uri_missing_raises_file_not_found(self, tmp_path):
+    def test_video_uri_missing_raises_file_not_found(self, tmp_path, monkeypatch):
         ro = _minimal_ro(
             video_uri=f"file://{tmp_path}/nonexistent_video.mp4",
             captions_uri=f"file://{tmp_path}/nonexistent_captions.srt",
         )
         with pytest.raises(FileNotFoundError, match="video_uri"):
-            self._run_with_ro(tmp_path, ro)
+            self._run_with_ro(tmp_path, monkeypatch, ro)
 
-    def test_captions_uri_missing_raises_file_not_found(self, tmp_path):
+    def test_captions_uri_missing_raises_file_not_found(self, tmp_path, monkeypatch):
         video_file = tmp_path / "video.mp4"
         video_file.write_bytes(b"fake video")
         ro = _minimal_ro(
@@ -337,7 +332,7 @@ class TestFileUriMissing:
             captions_uri=f"file://{tmp_path}/nonexistent_captions.srt",
         )
         with pytest.raises(FileNotFoundError, match="captions_uri"):
-            self._run_with_ro(tmp_path, ro)
+            self._run_with_ro(tmp_path, monkeypatch, ro)
 
 
 # ---------------------------------------------------------------------------
@@ -345,30 +340,29 @@ class TestFileUriMissing:
 # ---------------------------------------------------------------------------
 
 class TestHappyPath:
-    def _run_with_ro(self, tmp_path, ro: dict):
-        """Helper: mock call_agent to write ro as RenderOutput.json on disk."""
+    def _run_with_ro(self, tmp_path, monkeypatch, ro: dict):
+        """Helper: patch call_agent to write ro as RenderOutput.json on disk."""
         pid, run_id = "p", "r1"
         registry = ArtifactRegistry(tmp_path)
         _write_minimal_artifacts(registry, pid, run_id)
         ok = _make_call_agent_result(0)
+        monkeypatch.setattr(
+            stage5_render_preview, "call_agent", _make_write_ro_side_effect(ro, ok),
+        )
+        monkeypatch.setattr(stage5_render_preview, "find_agent_bin", lambda name: _VIDEO_BIN)
 
-        with patch("orchestrator.stages.stage5_render_preview.find_agent_bin", return_value=_VIDEO_BIN):
-            with patch(
-                "orchestrator.stages.stage5_render_preview.call_agent",
-                side_effect=_make_write_ro_side_effect(ro, ok),
-            ):
-                result = stage5_render_preview.run({"id": pid}, run_id, registry)
+        result = stage5_render_preview.run({"id": pid}, run_id, registry)
 
         return result, registry, pid, run_id
 
-    def test_non_file_uri_skips_disk_check(self, tmp_path):
+    def test_non_file_uri_skips_disk_check(self, tmp_path, monkeypatch):
         """https:// URIs are returned without disk existence checks."""
         ro = _minimal_ro()  # uses https:// URIs by default
-        result, registry, pid, run_id = self._run_with_ro(tmp_path, ro)
+        result, registry, pid, run_id = self._run_with_ro(tmp_path, monkeypatch, ro)
         assert result == ro
         assert registry.exists_and_valid(pid, run_id, "RenderOutput")
 
-    def test_file_uri_happy_path(self, tmp_path):
+    def test_file_uri_happy_path(self, tmp_path, monkeypatch):
         """file:// URIs that exist on disk pass; artifact is written to registry."""
         video_file    = tmp_path / "video.mp4"
         captions_file = tmp_path / "captions.srt"
@@ -379,18 +373,18 @@ class TestHappyPath:
             video_uri=f"file://{video_file}",
             captions_uri=f"file://{captions_file}",
         )
-        result, registry, pid, run_id = self._run_with_ro(tmp_path, ro)
+        result, registry, pid, run_id = self._run_with_ro(tmp_path, monkeypatch, ro)
         assert result == ro
         assert registry.exists_and_valid(pid, run_id, "RenderOutput")
 
-    def test_return_value_is_unchanged(self, tmp_path):
+    def test_return_value_is_unchanged(self, tmp_path, monkeypatch):
         """RenderOutput.json content must be returned without mutation."""
         ro = _minimal_ro()
         ro["provenance"] = {"rendered_at": "2025-01-15T12:00:00Z"}
-        result, _, _, _ = self._run_with_ro(tmp_path, ro)
+        result, _, _, _ = self._run_with_ro(tmp_path, monkeypatch, ro)
         assert result["provenance"]["rendered_at"] == "2025-01-15T12:00:00Z"
 
-    def test_cli_called_with_correct_flags(self, tmp_path):
+    def test_cli_called_with_correct_flags(self, tmp_path, monkeypatch):
         """call_agent must be invoked with 'video' and all four §41.4 flags."""
         pid, run_id = "p", "r1"
         registry = ArtifactRegistry(tmp_path)
@@ -403,12 +397,13 @@ class TestHappyPath:
             captured["args"] = list(args)
             out_idx = args.index("--out") + 1
             Path(args[out_idx]).parent.mkdir(parents=True, exist_ok=True)
-            Path(args[out_idx]).write_text(json.dumps(_minimal_ro()), encoding="utf-8")
+            Path(args[out_idx]).write_bytes(_RO_HTTPS_BYTES)
             return ok
 
-        with patch("orchestrator.stages.stage5_render_preview.find_agent_bin", return_value=_VIDEO_BIN):
-            with patch("orchestrator.stages.stage5_render_preview.call_agent", side_effect=capture_side_effect):
-                stage5_render_preview.run({"id": pid}, run_id, registry)
+        monkeypatch.setattr(stage5_render_preview, "call_agent", capture_side_effect)
+        monkeypatch.setattr(stage5_render_preview, "find_agent_bin", lambda name: _VIDEO_BIN)
+
+        stage5_render_preview.run({"id": pid}, run_id, registry)
 
         assert captured["name"] == "video"
         assert captured["args"][0] == "render"
@@ -1,16 +1,15 @@
 """Wave 4 tests: validate-run and diff CLI commands + integration smoke test."""
 
+import hashlib
 import json
 from pathlib import Path
-from unittest.mock import patch
 
 import pytest
 from click.testing import CliRunner
 
-from orchestrator.cli import cli
+from orchestrator.cli import _diff_run_dirs, cli, validate_run_errors
 from orchestrator.pipeline import PipelineRunner, compute_run_id
 from orchestrator.registry import ArtifactRegistry
-from orchestrator.utils.hashing import hash_file_bytes
 
 
 # ---------------------------------------------------------------------------
@@ -19,8 +18,15 @@ from orchestrator.utils.hashing import hash_file_bytes
 
 def _write_artifact(path: Path, data: dict) -> str:
     """Write JSON artifact to path, return sha256."""
-    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
-    return hash_file_bytes(path)
+    payload = json.dumps(data, indent=2).encode()
+    path.write_bytes(payload)
+    return hashlib.sha256(payload).hexdigest()
+
+
+# Fixed RunIndex fields shared by every _make_minimal_run_dir call.
+_RUN_INDEX_HEAD = {
+    "schema_id": "RunIndex", "schema_version": "0.0.2", "pipeline_version": "phase0",
+}
 
 
 def _make_minimal_run_dir(
@@ -42,15 +48,13 @@ def _make_minimal_run_dir(
                           "schema_version": data.get("schema_version", "1.0.0"),
                           "schema_id": data.get("schema_id", art_name)}],
         })
-    run_index: dict = {
-        "schema_id": "RunIndex", "schema_version": "0.0.2",
-        "run_id": run_id, "pipeline_version": "phase0", "stages": stages,
-    }
+    run_index = _RUN_INDEX_HEAD | {"run_id": run_id, "stages": stages}
     if status is not None:
         run_index["status"] = status
     if failure_reason is not None:
         run_index["failure_reason"] = failure_reason
-    (base / "RunIndex.json").write_text(json.dumps(run_index, indent=2), encoding="utf-8")
+    # Compact: only the CLI reads this file, and indenting it is pure overhead.
+    (base / "RunIndex.json").write_bytes(json.dumps(run_index).encode())
     return base
 
 
@@ -88,7 +92,7 @@ class TestValidateRunCommand:
         # Corrupt the artifact after RunIndex was written
         (run_dir / "Script.json").write_bytes(b"corrupted content")
         result = CliRunner(mix_stderr=False).invoke(cli, ["validate-run", "--run", str(run_dir)])
-        assert result.exit_code != 0
+        assert result.exit_code == 1
         assert "ERROR: hash mismatch for Script.json" in result.output
 
     def test_missing_schema_metadata(self, tmp_path):
@@ -110,9 +114,8 @@ class TestValidateRunCommand:
             }],
         }
         (run_dir / "RunIndex.json").write_text(json.dumps(run_index, indent=2), encoding="utf-8")
-        result = CliRunner(mix_stderr=False).invoke(cli, ["validate-run", "--run", str(run_dir)])
-        assert result.exit_code != 0
-        assert "ERROR: missing schema metadata for" in result.output
+        errors = validate_run_errors(run_dir)
+        assert any(e.startswith("ERROR: missing schema metadata for") for e in errors), errors
 
     def test_canon_decision_consistency_ok(self, tmp_path):
         """RunIndex no status + allow CanonDecision → passes (exit 0)."""
@@ -124,8 +127,7 @@ class TestValidateRunCommand:
             "decision_id": "test-allow-02",
         }
         (run_dir / "CanonDecision.json").write_text(json.dumps(canon), encoding="utf-8")
-        result = CliRunner(mix_stderr=False).invoke(cli, ["validate-run", "--run", str(run_dir)])
-        assert result.exit_code == 0
+        assert validate_run_errors(run_dir) == []
 
     def test_canon_decision_inconsistency(self, tmp_path):
         """RunIndex no status + deny CanonDecision → 'ERROR: CanonDecision inconsistency', exit non-zero."""
@@ -138,9 +140,8 @@ class TestValidateRunCommand:
             "decision_id": "test-deny-01",
         }
         (run_dir / "CanonDecision.json").write_text(json.dumps(canon), encoding="utf-8")
-        result = CliRunner(mix_stderr=False).invoke(cli, ["validate-run", "--run", str(run_dir)])
-        assert result.exit_code != 0
-        assert "ERROR: CanonDecision inconsistency" in result.output
+        errors = validate_run_errors(run_dir)
+        assert any(e.startswith("ERROR: CanonDecision inconsistency") for e in errors), errors
 
 
 # ===========================================================================
@@ -181,15 +182,12 @@ class TestDiffCommand:
         assert "/json[title]:" in result.output
 
     def test_output_is_deterministic(self, tmp_path):
-        """Run diff twice → assert output1 == output2."""
+        """Compute the diff twice → identical line lists."""
         dir_a = _make_minimal_run_dir(tmp_path / "run_a", {"Script": _MINIMAL_ARTIFACT})
         modified = {**_MINIMAL_ARTIFACT, "title": "Title X"}
         dir_b = _make_minimal_run_dir(tmp_path / "run_b", {"Script": modified})
 
-        runner = CliRunner(mix_stderr=False)
-        result1 = runner.invoke(cli, ["diff", "--run", str(dir_a), "--against", str(dir_b)])
-        result2 = runner.invoke(cli, ["diff", "--run", str(dir_a), "--against", str(dir_b)])
-        assert result1.output == result2.output
+        assert _diff_run_dirs(dir_a, dir_b) == _diff_run_dirs(dir_a, dir_b)
 
 
 # ===========================================================================
@@ -203,36 +201,23 @@ _SMOKE_PROJECT = {
     "cost_policy": {"max_budget_usd": 0.0, "external_ai": "disabled"},
 }
 
+# _SMOKE_PROJECT is never mutated, so its run_id is computed once.
+_SMOKE_RUN_ID = compute_run_id(_SMOKE_PROJECT)
+
 _CANON_ALLOW = {
     "schema_version": "1.0.0", "schema_id": "CanonDecision",
     "decision": "allow", "decision_id": "smoke-allow-01",
 }
 
-_STUB_RENDER_OUTPUT = {
-    "schema_version": "1.0.0", "schema_id": "RenderOutput",
-    "output_id": "smoke-001", "video_uri": "file:///tmp/smoke.mp4",
-    "captions_uri": "file:///tmp/smoke.srt",
-    "hashes": {"video_sha256": "a" * 64, "captions_sha256": "b" * 64},
-}
-
-
-def _stub_stage5(project_config, run_id, registry):
-    pid = project_config["id"]
-    ro = {**_STUB_RENDER_OUTPUT, "project_id": pid}
-    registry.write_artifact(pid, run_id, "RenderOutput", ro,
-                             parent_refs=[], creation_params={"stage": "stage5"})
-    return ro
-
-
 class TestIntegrationSmoke:
-    def test_smoke_run_validate_diff(self, tmp_path):
+    def test_smoke_run_validate_diff(self, tmp_path, mock_stage5):
         """Full pipeline → validate-run → diff-self smoke test."""
         # 1. Write project.json
         project_file = tmp_path / "project.json"
         project_file.write_text(json.dumps(_SMOKE_PROJECT), encoding="utf-8")
 
         # 2. Compute run_id and write CanonDecision.json + AssetManifest.media.json
-        run_id = compute_run_id(_SMOKE_PROJECT)
+        run_id = _SMOKE_RUN_ID
         artifacts_dir = tmp_path / "artifacts"
         run_dir = artifacts_dir / _SMOKE_PROJECT["id"] / run_id
         run_dir.mkdir(parents=True, exist_ok=True)
@@ -250,11 +235,10 @@ class TestIntegrationSmoke:
             }), encoding="utf-8"
         )
 
-        # 3. Run the pipeline with stage5 stubbed
+        # 3. Run the pipeline with stage5 stubbed (mock_stage5)
         registry = ArtifactRegistry(artifacts_dir)
-        with patch("orchestrator.stages.stage5_render_preview.run", side_effect=_stub_stage5):
-            runner = PipelineRunner(_SMOKE_PROJECT, registry, artifacts_dir)
-            summary = runner.run()
+        runner = PipelineRunner(_SMOKE_PROJECT, registry, artifacts_dir)
+        summary = runner.run()
 
         assert summary["status"] == "completed", f"Pipeline failed: {summary.get('errors')}"
 
@@ -1,10 +1,13 @@
 """Wave 5 tests: verify-system CLI command."""
 
-from unittest.mock import MagicMock, patch
+import json
+import subprocess
+from pathlib import Path
 
+import pytest
 from click.testing import CliRunner
 
-from orchestrator.cli import cli
+from orchestrator.cli import _diff_run_dirs, cli, validate_run_errors
 
 
 # ---------------------------------------------------------------------------
@@ -12,11 +15,32 @@ from orchestrator.cli import cli
 # ---------------------------------------------------------------------------
 
 def _proc(returncode=0, stdout="", stderr=""):
-    m = MagicMock()
-    m.returncode = returncode
-    m.stdout = stdout
-    m.stderr = stderr
-    return m
+    return subprocess.CompletedProcess(
+        args=[], returncode=returncode, stdout=stdout, stderr=stderr
+    )
+
+
+class _ScriptedRun:
+    """subprocess.run stand-in: returns (or raises) *steps* in call order."""
+
+    def __init__(self, *steps):
+        self._steps = iter(steps)
+        self.call_count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.call_count += 1
+        step = next(self._steps)
+        if isinstance(step, BaseException):
+            raise step
+        if callable(step):
+            return step(*args, **kwargs)
+        return step
+
+
+def _patch_run(monkeypatch, *steps) -> _ScriptedRun:
+    run = _ScriptedRun(*steps)
+    monkeypatch.setattr("orchestrator.cli.subprocess.run", run)
+    return run
 
 
 # ===========================================================================
@@ -24,99 +48,157 @@ def _proc(returncode=0, stdout="", stderr=""):
 # ===========================================================================
 
 class TestVerifySystemCommand:
-    def test_all_pass(self):
-        """All 6 subprocess calls return exit 0 → 'OK: system verified', exit 0."""
-        with patch("orchestrator.cli.subprocess.run") as mock_run:
-            mock_run.side_effect = [
-                _proc(),  # world-engine verify
-                _proc(),  # media verify
-                _proc(),  # video verify
-                _proc(),  # orchestrator run
-                _proc(),  # orchestrator validate-run
-                _proc(),  # orchestrator diff
-            ]
-            result = CliRunner(mix_stderr=False).invoke(cli, ["verify-system"])
+    @pytest.fixture(autouse=True)
+    def _passing_run_checks(self, monkeypatch):
+        """validate-run and diff run in-process; by default they find nothing.
+
+        subprocess.run is scripted, so no run dir is really produced.
+        """
+        monkeypatch.setattr("orchestrator.cli.validate_run_errors", lambda run_dir: [])
+        monkeypatch.setattr("orchestrator.cli._diff_run_dirs", lambda dir_a, dir_b: [])
+
+    def test_all_pass(self, monkeypatch):
+        """All 4 subprocess calls return exit 0 → 'OK: system verified', exit 0."""
+        _patch_run(
+            monkeypatch,
+            _proc(),  # world-engine verify
+            _proc(),  # media verify
+            _proc(),  # video verify
+            _proc(),  # orchestrator run
+        )
+        result = CliRunner(mix_stderr=False).invoke(cli, ["verify-system"])
         assert result.exit_code == 0, result.output
         assert "OK: system verified" in result.output
 
-    def test_external_tool_fail(self):
+    def test_external_tool_fail(self, monkeypatch):
         """world-engine verify returns exit 1 → 'FAIL: world-engine verify' + error text, exit nonzero."""
         error_text = "world-engine: health check failed\n"
-        with patch("orchestrator.cli.subprocess.run") as mock_run:
-            mock_run.side_effect = [
-                _proc(returncode=1, stderr=error_text),  # world-engine verify
-                _proc(),  # media verify
-                _proc(),  # video verify
-                _proc(),  # orchestrator run
-                _proc(),  # orchestrator validate-run
-                _proc(),  # orchestrator diff
-            ]
-            result = CliRunner(mix_stderr=False).invoke(cli, ["verify-system"])
+        _patch_run(
+            monkeypatch,
+            _proc(returncode=1, stderr=error_text),  # world-engine verify
+            _proc(),  # media verify
+            _proc(),  # video verify
+            _proc(),  # orchestrator run
+        )
+        result = CliRunner(mix_stderr=False).invoke(cli, ["verify-system"])
         assert result.exit_code != 0
         assert "FAIL: world-engine verify" in result.output
         assert "health check failed" in result.output
 
-    def test_command_not_found(self):
+    def test_command_not_found(self, monkeypatch):
         """subprocess.run raises FileNotFoundError → step is silently skipped (not a failure)."""
-        with patch("orchestrator.cli.subprocess.run") as mock_run:
-            mock_run.side_effect = [
-                FileNotFoundError("world-engine not found"),  # world-engine verify → skip
-                _proc(),  # media verify
-                _proc(),  # video verify
-                _proc(),  # orchestrator run
-                _proc(),  # orchestrator validate-run
-                _proc(),  # orchestrator diff
-            ]
-            result = CliRunner(mix_stderr=False).invoke(cli, ["verify-system"])
+        _patch_run(
+            monkeypatch,
+            FileNotFoundError("world-engine not found"),  # world-engine verify → skip
+            _proc(),  # media verify
+            _proc(),  # video verify
+            _proc(),  # orchestrator run
+        )
+        result = CliRunner(mix_stderr=False).invoke(cli, ["verify-system"])
         assert result.exit_code == 0
         assert "OK: system verified" in result.output
 
-    def test_pipeline_fail_skips_validate_diff(self):
-        """Steps 1–3 pass, step 4 returns exit 1 → only 4 subprocess calls made."""
+    def test_pipeline_fail_skips_validate_diff(self, monkeypatch):
+        """Steps 1–3 pass, step 4 returns exit 1 → validate-run and diff never run."""
         error_text = "pipeline failed\n"
-        with patch("orchestrator.cli.subprocess.run") as mock_run:
-            mock_run.side_effect = [
-                _proc(),  # world-engine verify
-                _proc(),  # media verify
-                _proc(),  # video verify
-                _proc(returncode=1, stderr=error_text),  # orchestrator run
-            ]
-            result = CliRunner(mix_stderr=False).invoke(cli, ["verify-system"])
+        checked: list[str] = []
+        monkeypatch.setattr(
+            "orchestrator.cli.validate_run_errors", lambda run_dir: checked.append("validate")
+        )
+        monkeypatch.setattr(
+            "orchestrator.cli._diff_run_dirs", lambda dir_a, dir_b: checked.append("diff")
+        )
+        run = _patch_run(
+            monkeypatch,
+            _proc(),  # world-engine verify
+            _proc(),  # media verify
+            _proc(),  # video verify
+            _proc(returncode=1, stderr=error_text),  # orchestrator run
+        )
+        result = CliRunner(mix_stderr=False).invoke(cli, ["verify-system"])
         assert result.exit_code != 0
         assert "FAIL: orchestrator run" in result.output
-        assert mock_run.call_count == 4
-
-    def test_validate_fail_shown(self):
-        """Steps 1–4 pass, step 5 returns exit 1 → 'FAIL: orchestrator validate-run' + error text, exit nonzero."""
-        error_text = "validate error details\n"
-        with patch("orchestrator.cli.subprocess.run") as mock_run:
-            mock_run.side_effect = [
-                _proc(),  # world-engine verify
-                _proc(),  # media verify
-                _proc(),  # video verify
-                _proc(),  # orchestrator run
-                _proc(returncode=1, stderr=error_text),  # orchestrator validate-run
-                _proc(),  # orchestrator diff
-            ]
-            result = CliRunner(mix_stderr=False).invoke(cli, ["verify-system"])
+        assert run.call_count == 4
+        assert checked == []
+
+    def test_validate_fail_shown(self, monkeypatch):
+        """Steps 1–4 pass, step 5 reports errors → 'FAIL: orchestrator validate-run' + error text, exit nonzero."""
+        monkeypatch.setattr(
+            "orchestrator.cli.validate_run_errors", lambda run_dir: ["validate error details"]
+        )
+        _patch_run(
+            monkeypatch,
+            _proc(),  # world-engine verify
+            _proc(),  # media verify
+            _proc(),  # video verify
+            _proc(),  # orchestrator run
+        )
+        result = CliRunner(mix_stderr=False).invoke(cli, ["verify-system"])
         assert result.exit_code != 0
         assert "FAIL: orchestrator validate-run" in result.output
         assert "validate error details" in result.output
 
-    def test_output_deterministic(self):
+    def test_diff_key_error_shown(self, monkeypatch):
+        """A RunIndex entry without "sha256" → 'FAIL: orchestrator diff', not a traceback."""
+        def _raise_key_error(dir_a, dir_b):
+            raise KeyError("sha256")
+
+        monkeypatch.setattr("orchestrator.cli._diff_run_dirs", _raise_key_error)
+        _patch_run(
+            monkeypatch,
+            _proc(),  # world-engine verify
+            _proc(),  # media verify
+            _proc(),  # video verify
+            _proc(),  # orchestrator run
+        )
+        result = CliRunner(mix_stderr=False).invoke(cli, ["verify-system"])
+        assert result.exit_code == 1
+        assert "FAIL: orchestrator diff" in result.output
+        assert "ERROR: RunIndex entry missing key 'sha256'" in result.output
+
+    def test_malformed_run_index_reported(self, monkeypatch):
+        """A real run dir whose RunIndex entry lacks "sha256" → FAIL lines, not a traceback."""
+        # Undo _passing_run_checks: both checks run against the real run dir.
+        monkeypatch.setattr("orchestrator.cli.validate_run_errors", validate_run_errors)
+        monkeypatch.setattr("orchestrator.cli._diff_run_dirs", _diff_run_dirs)
+
+        def _write_malformed_run(cmd, **kwargs):
+            artifacts_dir = Path(cmd[cmd.index("--artifacts-dir") + 1])
+            run_dir = next(artifacts_dir.glob("*/run-*"))
+            (run_dir / "Script.json").write_text("{}", encoding="utf-8")
+            (run_dir / "RunIndex.json").write_text(json.dumps({
+                "run_id": "r",
+                "stages": [{"name": "stage1", "inputs": [],
+                            "outputs": [{"path": "Script.json"}]}],
+            }), encoding="utf-8")
+            return _proc()
+
+        _patch_run(
+            monkeypatch,
+            _proc(),  # world-engine verify
+            _proc(),  # media verify
+            _proc(),  # video verify
+            _write_malformed_run,  # orchestrator run
+        )
+        result = CliRunner(mix_stderr=False).invoke(cli, ["verify-system"])
+        assert result.exit_code == 1
+        assert isinstance(result.exception, SystemExit)
+        assert "FAIL: orchestrator validate-run" in result.output
+        assert "FAIL: orchestrator diff" in result.output
+        assert "ERROR: RunIndex entry missing key 'sha256'" in result.output
+
+    def test_output_deterministic(self, monkeypatch):
         """Two invocations with identical mock results → result1.output == result2.output and both exit 0."""
         def make_side_effects():
-            return [_proc(), _proc(), _proc(), _proc(), _proc(), _proc()]
+            return [_proc(), _proc(), _proc(), _proc()]
 
         runner = CliRunner(mix_stderr=False)
 
-        with patch("orchestrator.cli.subprocess.run") as mock_run:
-            mock_run.side_effect = make_side_effects()
-            result1 = runner.invoke(cli, ["verify-system"])
+        _patch_run(monkeypatch, *make_side_effects())
+        result1 = runner.invoke(cli, ["verify-system"])
 
-        with patch("orchestrator.cli.subprocess.run") as mock_run:
-            mock_run.side_effect = make_side_effects()
-            result2 = runner.invoke(cli, ["verify-system"])
+        _patch_run(monkeypatch, *make_side_effects())
+        result2 = runner.invoke(cli, ["verify-system"])
 
         assert result1.exit_code == 0
         assert result2.exit_code == 0
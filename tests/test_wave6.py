@@ -1,14 +1,15 @@
 """Wave 6 tests: EpisodeBundle packaging (package + validate-bundle CLI commands)."""
 
 import json
+import shutil
 from pathlib import Path
 
 import pytest
 from click.testing import CliRunner
 
-from orchestrator.cli import cli
+from orchestrator.cli import cli, validate_bundle_errors
 from orchestrator.packager import package_episode
-from orchestrator.utils.hashing import hash_artifact, hash_file_bytes
+from orchestrator.utils.hashing import canonical_json_bytes, hash_artifact, hash_file_bytes
 
 
 # ---------------------------------------------------------------------------
@@ -71,15 +72,42 @@ def _write_json(path: Path, data: dict) -> None:
     path.write_text(json.dumps(data, indent=2), encoding="utf-8")
 
 
+def _load_bundle(bundle_root: Path) -> dict:
+    """Parse <bundle_root>/EpisodeBundle.json (one read, straight from bytes)."""
+    return json.loads((bundle_root / "EpisodeBundle.json").read_bytes())
+
+
+@pytest.fixture(scope="session")
+def canonical_run_dir(tmp_path_factory) -> Path:
+    """_make_run_dir() materialised once per session; tests clone it with _clone_run.
+
+    Under pytest-xdist each worker builds its own copy in its own basetemp.
+    PACKAGER_NOW_UTC is set per test through monkeypatch, never here.
+    """
+    return _make_run_dir(tmp_path_factory.mktemp("canonical"))
+
+
+def _clone_run(canonical: Path, tmp_path: Path) -> Path:
+    """Copy *canonical* to tmp_path/run so a test may perturb its files.
+
+    Copied rather than hard-linked: _write_json rewrites files in place, which
+    would write through a link into the shared template.  RenderOutput's
+    file:// media URIs keep pointing at the canonical (read-only) media.
+    """
+    run_dir = tmp_path / "run"
+    shutil.copytree(canonical, run_dir)
+    return run_dir
+
+
 # ---------------------------------------------------------------------------
 # TestPackageCommand
 # ---------------------------------------------------------------------------
 
 class TestPackageCommand:
-    def test_happy_path_deterministic(self, tmp_path, monkeypatch):
+    def test_happy_path_deterministic(self, tmp_path, canonical_run_dir, monkeypatch):
         """Package twice with fixed timestamp → identical EpisodeBundle.json bytes."""
         monkeypatch.setenv("PACKAGER_NOW_UTC", "2026-02-20T00:00:00Z")
-        run_dir = _make_run_dir(tmp_path)
+        run_dir = _clone_run(canonical_run_dir, tmp_path)
         runner = CliRunner()
 
         out1 = tmp_path / "out1"
@@ -106,43 +134,35 @@ class TestPackageCommand:
         bundle2 = (out2 / "ep001" / "EpisodeBundle.json").read_bytes()
         assert bundle1 == bundle2, "EpisodeBundle.json bytes differ between two identical runs"
 
-    def test_bundle_hash_valid(self, tmp_path, monkeypatch):
+    def test_bundle_hash_valid(self, tmp_path, canonical_run_dir, monkeypatch):
         """bundle_hash in EpisodeBundle.json matches hash_artifact(bundle_without_hash)."""
         monkeypatch.setenv("PACKAGER_NOW_UTC", "2026-02-20T00:00:00Z")
-        run_dir = _make_run_dir(tmp_path)
+        run_dir = _clone_run(canonical_run_dir, tmp_path)
         out_dir = tmp_path / "out"
 
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            "package",
-            "--run", str(run_dir),
-            "--episode-id", "ep001",
-            "--out", str(out_dir),
-        ])
-        assert result.exit_code == 0, result.output
+        package_episode(run_dir, "ep001", out_dir)
 
-        bundle_data = json.loads(
-            (out_dir / "ep001" / "EpisodeBundle.json").read_text(encoding="utf-8")
-        )
+        bundle_data = _load_bundle(out_dir / "ep001")
         without_hash = {k: v for k, v in bundle_data.items()
                         if k not in ("bundle_hash", "created_utc")}
         expected = hash_artifact(without_hash)
         assert bundle_data["bundle_hash"] == expected
 
-    def test_layout_paths_correct(self, tmp_path, monkeypatch):
+    def test_bundle_json_is_canonical(self, tmp_path, canonical_run_dir, monkeypatch):
+        """EpisodeBundle.json is written sorted, compact and newline-terminated."""
+        monkeypatch.setenv("PACKAGER_NOW_UTC", "2026-02-20T00:00:00Z")
+        run_dir = _clone_run(canonical_run_dir, tmp_path)
+        bundle_root = package_episode(run_dir, "ep001", tmp_path / "out")
+        raw = (bundle_root / "EpisodeBundle.json").read_bytes()
+        assert raw == canonical_json_bytes(json.loads(raw)) + b"\n"
+
+    def test_layout_paths_correct(self, tmp_path, canonical_run_dir, monkeypatch):
         """All expected paths exist under the bundle root after packaging."""
         monkeypatch.setenv("PACKAGER_NOW_UTC", "2026-02-20T00:00:00Z")
-        run_dir = _make_run_dir(tmp_path)
+        run_dir = _clone_run(canonical_run_dir, tmp_path)
         out_dir = tmp_path / "out"
 
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            "package",
-            "--run", str(run_dir),
-            "--episode-id", "ep001",
-            "--out", str(out_dir),
-        ])
-        assert result.exit_code == 0, result.output
+        package_episode(run_dir, "ep001", out_dir)
 
         bundle_root = out_dir / "ep001"
         expected_paths = [
@@ -161,25 +181,16 @@ class TestPackageCommand:
         for rel in expected_paths:
             assert (bundle_root / rel).exists(), f"Missing expected path: {rel}"
 
-    def test_sha256_entries_match_files(self, tmp_path, monkeypatch):
-        """sha256 in each artifacts entry matches hash_file_bytes() of the actual file."""
+    def test_sha256_entries_match_files(self, tmp_path, canonical_run_dir, monkeypatch):
+        """sha256 in each artifacts entry matches hash_file_bytes() of the bundled file."""
         monkeypatch.setenv("PACKAGER_NOW_UTC", "2026-02-20T00:00:00Z")
-        run_dir = _make_run_dir(tmp_path)
+        run_dir = _clone_run(canonical_run_dir, tmp_path)
         out_dir = tmp_path / "out"
 
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            "package",
-            "--run", str(run_dir),
-            "--episode-id", "ep001",
-            "--out", str(out_dir),
-        ])
-        assert result.exit_code == 0, result.output
+        package_episode(run_dir, "ep001", out_dir)
 
         bundle_root = out_dir / "ep001"
-        bundle_data = json.loads(
-            (bundle_root / "EpisodeBundle.json").read_text(encoding="utf-8")
-        )
+        bundle_data = _load_bundle(bundle_root)
         for name, entry in bundle_data["artifacts"].items():
             fp = bundle_root / entry["path"]
             assert fp.exists(), f"Artifact file missing: {entry['path']}"
@@ -189,9 +200,9 @@ class TestPackageCommand:
                 f"got {actual[:12]}..."
             )
 
-    def test_missing_artifact_fails(self, tmp_path):
-        """Missing CanonDecision.json → exit nonzero + error message."""
-        run_dir = _make_run_dir(tmp_path)
+    def test_missing_artifact_fails(self, tmp_path, canonical_run_dir):
+        """Missing CanonDecision.json → exit 1 + error message."""
+        run_dir = _clone_run(canonical_run_dir, tmp_path)
         (run_dir / "CanonDecision.json").unlink()
         out_dir = tmp_path / "out"
 
@@ -202,64 +213,46 @@ class TestPackageCommand:
             "--episode-id", "ep001",
             "--out", str(out_dir),
         ])
-        assert result.exit_code != 0
+        assert result.exit_code == 1
         assert "ERROR: missing required artifact: CanonDecision" in result.output
 
-    def test_optional_fingerprint_included(self, tmp_path, monkeypatch):
+    def test_optional_fingerprint_included(self, tmp_path, canonical_run_dir, monkeypatch):
         """When render_fingerprint.json exists, RenderFingerprint key appears in artifacts."""
         monkeypatch.setenv("PACKAGER_NOW_UTC", "2026-02-20T00:00:00Z")
-        run_dir = _make_run_dir(tmp_path)
+        run_dir = _clone_run(canonical_run_dir, tmp_path)
         _write_json(run_dir / "render_fingerprint.json", {
             "schema_id": "RenderFingerprint", "schema_version": "1.0.0",
             "fingerprint": "abc123",
         })
         out_dir = tmp_path / "out"
 
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            "package",
-            "--run", str(run_dir),
-            "--episode-id", "ep001",
-            "--out", str(out_dir),
-        ])
-        assert result.exit_code == 0, result.output
+        package_episode(run_dir, "ep001", out_dir)
 
-        bundle_data = json.loads(
-            (out_dir / "ep001" / "EpisodeBundle.json").read_text(encoding="utf-8")
-        )
+        bundle_data = _load_bundle(out_dir / "ep001")
         assert "RenderFingerprint" in bundle_data["artifacts"], (
             "Expected RenderFingerprint key when render_fingerprint.json is present"
         )
 
-    def test_optional_fingerprint_absent(self, tmp_path, monkeypatch):
+    def test_optional_fingerprint_absent(self, tmp_path, canonical_run_dir, monkeypatch):
         """When render_fingerprint.json is absent, RenderFingerprint key not in artifacts."""
         monkeypatch.setenv("PACKAGER_NOW_UTC", "2026-02-20T00:00:00Z")
-        run_dir = _make_run_dir(tmp_path)
+        run_dir = _clone_run(canonical_run_dir, tmp_path)
         # Ensure it is NOT present (default fixture doesn't include it)
         fingerprint = run_dir / "render_fingerprint.json"
         if fingerprint.exists():
             fingerprint.unlink()
         out_dir = tmp_path / "out"
 
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            "package",
-            "--run", str(run_dir),
-            "--episode-id", "ep001",
-            "--out", str(out_dir),
-        ])
-        assert result.exit_code == 0, result.output
+        package_episode(run_dir, "ep001", out_dir)
 
-        bundle_data = json.loads(
-            (out_dir / "ep001" / "EpisodeBundle.json").read_text(encoding="utf-8")
-        )
+        bundle_data = _load_bundle(out_dir / "ep001")
         assert "RenderFingerprint" not in bundle_data["artifacts"], (
             "RenderFingerprint key should be absent when render_fingerprint.json is missing"
         )
 
-    def test_unsupported_uri_scheme_fails(self, tmp_path):
-        """A non-file:// URI scheme in RenderOutput.json → exit nonzero + scheme error."""
-        run_dir = _make_run_dir(tmp_path)
+    def test_unsupported_uri_scheme_fails(self, tmp_path, canonical_run_dir):
+        """A non-file:// URI scheme in RenderOutput.json → ValueError naming the scheme."""
+        run_dir = _clone_run(canonical_run_dir, tmp_path)
         # Overwrite RenderOutput.json with an https:// video_uri
         _write_json(run_dir / "RenderOutput.json", {
             "schema_id": "RenderOutput", "schema_version": "1.0.0",
@@ -270,15 +263,8 @@ class TestPackageCommand:
         })
         out_dir = tmp_path / "out"
 
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            "package",
-            "--run", str(run_dir),
-            "--episode-id", "ep001",
-            "--out", str(out_dir),
-        ])
-        assert result.exit_code != 0
-        assert "Unsupported URI scheme" in result.output
+        with pytest.raises(ValueError, match="Unsupported URI scheme"):
+            package_episode(run_dir, "ep001", out_dir)
 
 
 # ---------------------------------------------------------------------------
@@ -286,17 +272,17 @@ class TestPackageCommand:
 # ---------------------------------------------------------------------------
 
 class TestValidateBundleCommand:
-    def _build_bundle(self, tmp_path: Path, monkeypatch) -> Path:
+    def _build_bundle(self, tmp_path: Path, canonical_run_dir: Path, monkeypatch) -> Path:
         """Helper: build a valid bundle and return bundle_root."""
         monkeypatch.setenv("PACKAGER_NOW_UTC", "2026-02-20T00:00:00Z")
-        run_dir = _make_run_dir(tmp_path)
+        run_dir = _clone_run(canonical_run_dir, tmp_path)
         out_dir = tmp_path / "out"
         bundle_root = package_episode(run_dir, "ep001", out_dir)
         return bundle_root
 
-    def test_valid_bundle(self, tmp_path, monkeypatch):
+    def test_valid_bundle(self, tmp_path, canonical_run_dir, monkeypatch):
         """A freshly-packaged bundle → 'OK: bundle valid', exit 0."""
-        bundle_root = self._build_bundle(tmp_path, monkeypatch)
+        bundle_root = self._build_bundle(tmp_path, canonical_run_dir, monkeypatch)
 
         runner = CliRunner()
         result = runner.invoke(cli, [
@@ -306,9 +292,9 @@ class TestValidateBundleCommand:
         assert result.exit_code == 0, result.output
         assert "OK: bundle valid" in result.output
 
-    def test_corrupt_file_fails(self, tmp_path, monkeypatch):
-        """Corrupting artifacts/Script.json bytes → hash mismatch error, exit nonzero."""
-        bundle_root = self._build_bundle(tmp_path, monkeypatch)
+    def test_corrupt_file_fails(self, tmp_path, canonical_run_dir, monkeypatch):
+        """Corrupting artifacts/Script.json bytes → hash mismatch error, exit 1."""
+        bundle_root = self._build_bundle(tmp_path, canonical_run_dir, monkeypatch)
         script_path = bundle_root / "artifacts" / "Script.json"
         # Corrupt the file by appending a byte
         script_path.write_bytes(script_path.read_bytes() + b"\x00")
@@ -318,40 +304,51 @@ class TestValidateBundleCommand:
             "validate-bundle",
             "--bundle", str(bundle_root),
         ])
-        assert result.exit_code != 0
+        assert result.exit_code == 1
         assert "ERROR: hash mismatch for artifacts/Script.json" in result.output
 
-    def test_corrupt_bundle_hash_fails(self, tmp_path, monkeypatch):
+    def test_missing_file_fails(self, tmp_path, canonical_run_dir, monkeypatch):
+        """Deleting a bundled file → missing file error for that path only."""
+        bundle_root = self._build_bundle(tmp_path, canonical_run_dir, monkeypatch)
+        (bundle_root / "media" / "captions.srt").unlink()
+
+        assert validate_bundle_errors(bundle_root) == ["ERROR: missing file: media/captions.srt"]
+
+    def test_corrupt_bundle_hash_fails(self, tmp_path, canonical_run_dir, monkeypatch):
         """Tampering with bundle_hash in EpisodeBundle.json → bundle_hash mismatch error."""
-        bundle_root = self._build_bundle(tmp_path, monkeypatch)
+        bundle_root = self._build_bundle(tmp_path, canonical_run_dir, monkeypatch)
         bundle_json_path = bundle_root / "EpisodeBundle.json"
 
-        bundle_data = json.loads(bundle_json_path.read_text(encoding="utf-8"))
+        bundle_data = _load_bundle(bundle_root)
         bundle_data["bundle_hash"] = "0" * 64  # corrupt the hash
         bundle_json_path.write_text(json.dumps(bundle_data, indent=2), encoding="utf-8")
 
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            "validate-bundle",
-            "--bundle", str(bundle_root),
-        ])
-        assert result.exit_code != 0
-        assert "ERROR: bundle_hash mismatch" in result.output
+        assert "ERROR: bundle_hash mismatch" in validate_bundle_errors(bundle_root)
 
-    def test_bundle_hash_excludes_created_utc(self, tmp_path, monkeypatch):
+    def test_bundle_hash_excludes_created_utc(self, tmp_path, canonical_run_dir, monkeypatch):
         """Changing created_utc in EpisodeBundle.json does not invalidate bundle_hash."""
-        bundle_root = self._build_bundle(tmp_path, monkeypatch)
+        bundle_root = self._build_bundle(tmp_path, canonical_run_dir, monkeypatch)
         bundle_json_path = bundle_root / "EpisodeBundle.json"
 
         # Overwrite created_utc with a different timestamp
-        bundle_data = json.loads(bundle_json_path.read_text(encoding="utf-8"))
+        bundle_data = _load_bundle(bundle_root)
         bundle_data["created_utc"] = "1999-01-01T00:00:00Z"
         bundle_json_path.write_text(json.dumps(bundle_data, indent=2), encoding="utf-8")
 
-        runner = CliRunner()
-        result = runner.invoke(cli, [
-            "validate-bundle",
-            "--bundle", str(bundle_root),
-        ])
-        assert result.exit_code == 0, result.output
-        assert "OK: bundle valid" in result.output
+        assert validate_bundle_errors(bundle_root) == []
+
+    def test_equivalent_entry_paths_validate(self, tmp_path, canonical_run_dir, monkeypatch):
+        """'./media/x' and 'media//x' name the same bundled file as 'media/x'."""
+        bundle_root = self._build_bundle(tmp_path, canonical_run_dir, monkeypatch)
+        bundle_json_path = bundle_root / "EpisodeBundle.json"
+
+        bundle_data = _load_bundle(bundle_root)
+        artifacts = bundle_data["artifacts"]
+        artifacts["VideoMP4"]["path"] = "./media/video.mp4"
+        artifacts["CaptionsSRT"]["path"] = "media//captions.srt"
+        bundle_data["bundle_hash"] = hash_artifact(
+            {k: v for k, v in bundle_data.items() if k not in ("bundle_hash", "created_utc")}
+        )
+        bundle_json_path.write_text(json.dumps(bundle_data, indent=2), encoding="utf-8")
+
+        assert validate_bundle_errors(bundle_root) == []
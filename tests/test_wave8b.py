@@ -1,19 +1,25 @@
 """Wave 8b tests: derived-hash normalization for investigate-determinism."""
 
+import functools
 import hashlib
 import json
-from contextlib import ExitStack
 from pathlib import Path
-from unittest.mock import patch
 
 import pytest
 from click.testing import CliRunner
 
 from orchestrator.cli import _compare_contract_artifacts, cli
+from orchestrator.stages import (
+    stage1_generate_script,
+    stage2_script_to_shotlist,
+    stage3_shotlist_to_assetmanifest,
+    stage4_build_renderplan,
+    stage5_render_preview,
+)
 
 
 # ---------------------------------------------------------------------------
-# Shared project fixture
+# Project (written to project.json once per module by project_file)
 # ---------------------------------------------------------------------------
 
 _PROJECT = {
@@ -22,6 +28,11 @@ _PROJECT = {
     "genre": "sci-fi",
 }
 
+
+@pytest.fixture(scope="module")
+def project_file(write_project_file) -> Path:
+    return write_project_file(_PROJECT)
+
 # Stable semantic content used across tests
 _CHAR_PACKS = [{"asset_id": "char-alice", "pack_id": "char-alice", "character_id": "alice", "display_name": "Alice", "license_type": "proprietary_cleared"}]
 _TIMING_LOCK = "tlh-stable-abc123"
@@ -31,20 +42,38 @@ _TIMING_LOCK = "tlh-stable-abc123"
 # Helper: build a complete run directory for direct _compare_contract_artifacts tests
 # ---------------------------------------------------------------------------
 
+# Same form as the normalised manifest/plan hashed by verify-system; every
+# fixture file is only json-parsed back, so all of them are written this way.
+_CANONICAL_ENCODER = json.JSONEncoder(
+    sort_keys=True, separators=(",", ":"), ensure_ascii=False
+)
+
+
 def _canonical_bytes(obj: dict) -> bytes:
-    return json.dumps(
-        obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False
-    ).encode("utf-8")
+    return _CANONICAL_ENCODER.encode(obj).encode("utf-8")
+
 
+def _write_json(path: Path, data: dict) -> None:
+    path.write_bytes(_canonical_bytes(data))
 
-def _raw_render_hashes(manifest: dict, plan: dict) -> dict:
-    """Compute raw hashes as the real renderer would (from non-normalized data)."""
-    mb = _canonical_bytes(manifest)
-    pb = _canonical_bytes(plan)
+
+@functools.lru_cache(maxsize=64)
+def _raw_render_hashes(mb: bytes, pb: bytes) -> dict:
+    """Compute raw hashes as the real renderer would (from non-normalized data).
+
+    *mb* and *pb* are the ``_canonical_bytes`` of the manifest and plan.
+    Memoised on those bytes; callers must not mutate the returned dict.
+    """
+    h_manifest = hashlib.sha256(mb)
+    # inputs_digest = sha256(mb + b"\n" + pb): continue from the manifest state
+    # instead of concatenating and re-hashing the manifest bytes.
+    h_inputs = h_manifest.copy()
+    h_inputs.update(b"\n")
+    h_inputs.update(pb)
     return {
-        "asset_manifest_hash": hashlib.sha256(mb).hexdigest(),
+        "asset_manifest_hash": h_manifest.hexdigest(),
         "render_plan_hash": hashlib.sha256(pb).hexdigest(),
-        "inputs_digest": hashlib.sha256(mb + b"\n" + pb).hexdigest(),
+        "inputs_digest": h_inputs.hexdigest(),
     }
 
 
@@ -61,27 +90,21 @@ def _write_run_dir(
     run_dir.mkdir(parents=True, exist_ok=True)
 
     # CanonDecision — identical across runs
-    (run_dir / "CanonDecision.json").write_text(
-        json.dumps({
-            "schema_id": "CanonDecision",
-            "schema_version": "1.0.0",
-            "decision": "allow",
-            "decision_id": "test-canon-001",
-        }, indent=2),
-        encoding="utf-8",
-    )
+    _write_json(run_dir / "CanonDecision.json", {
+        "schema_id": "CanonDecision",
+        "schema_version": "1.0.0",
+        "decision": "allow",
+        "decision_id": "test-canon-001",
+    })
 
     # ShotList — run-identity in shotlist_id, stable semantic content
-    (run_dir / "ShotList.json").write_text(
-        json.dumps({
-            "schema_id": "ShotList",
-            "schema_version": "1.0.0",
-            "shotlist_id": f"shotlist-proj-{suffix}",
-            "timing_lock_hash": _TIMING_LOCK,
-            "total_duration_sec": 60.0,
-        }, indent=2),
-        encoding="utf-8",
-    )
+    _write_json(run_dir / "ShotList.json", {
+        "schema_id": "ShotList",
+        "schema_version": "1.0.0",
+        "shotlist_id": f"shotlist-proj-{suffix}",
+        "timing_lock_hash": _TIMING_LOCK,
+        "total_duration_sec": 60.0,
+    })
 
     # AssetManifest_draft — run-identity in manifest_id / shotlist_ref
     manifest = {
@@ -91,9 +114,10 @@ def _write_run_dir(
         "shotlist_ref": f"shotlist-proj-{suffix}",
         "character_packs": _CHAR_PACKS,
     }
-    (run_dir / "AssetManifest_draft.json").write_text(
-        json.dumps(manifest, indent=2), encoding="utf-8"
-    )
+    # Canonical bytes are written as-is (the verifier only json-parses them)
+    # and hashed below, so each input is serialized exactly once.
+    manifest_canon = _canonical_bytes(manifest)
+    (run_dir / "AssetManifest_draft.json").write_bytes(manifest_canon)
 
     # RenderPlan — run-identity in plan_id / manifest_ref; fps is semantic
     plan = {
@@ -104,38 +128,38 @@ def _write_run_dir(
         "timing_lock_hash": _TIMING_LOCK,
         "fps": fps,
     }
-    (run_dir / "RenderPlan.json").write_text(
-        json.dumps(plan, indent=2), encoding="utf-8"
-    )
+    plan_canon = _canonical_bytes(plan)
+    (run_dir / "RenderPlan.json").write_bytes(plan_canon)
 
     # RenderOutput — raw derived hashes computed from the *non-normalized* inputs
     # (this simulates the real renderer, which embeds run-specific IDs in the hash)
-    raw = _raw_render_hashes(manifest, plan)
-    (run_dir / "RenderOutput.json").write_text(
-        json.dumps({
-            "schema_id": "RenderOutput",
-            "schema_version": "1.0.0",
-            "output_id": f"ro-{suffix}",
-            "hashes": {"video_sha256": "aabbccdd"},
-            "inputs_digest": raw["inputs_digest"],
-            "lineage": {
-                "asset_manifest_hash": raw["asset_manifest_hash"],
-                "render_plan_hash": raw["render_plan_hash"],
-            },
-        }, indent=2),
-        encoding="utf-8",
-    )
+    raw = _raw_render_hashes(manifest_canon, plan_canon)
+    _write_json(run_dir / "RenderOutput.json", {
+        "schema_id": "RenderOutput",
+        "schema_version": "1.0.0",
+        "output_id": f"ro-{suffix}",
+        "hashes": {"video_sha256": "aabbccdd"},
+        "inputs_digest": raw["inputs_digest"],
+        "lineage": {
+            "asset_manifest_hash": raw["asset_manifest_hash"],
+            "render_plan_hash": raw["render_plan_hash"],
+        },
+    })
 
 
 # ---------------------------------------------------------------------------
 # Stage stubs for CLI-based tests
 # ---------------------------------------------------------------------------
 
-def _write_artifact_json(registry, project_id, run_id, artifact_type, data):
+def _write_artifact_bytes(registry, project_id, run_id, artifact_type, payload):
     run_dir = registry.run_dir(project_id, run_id)
     run_dir.mkdir(parents=True, exist_ok=True)
-    (run_dir / f"{artifact_type}.json").write_text(
-        json.dumps(data, indent=2), encoding="utf-8"
+    (run_dir / f"{artifact_type}.json").write_bytes(payload)
+
+
+def _write_artifact_json(registry, project_id, run_id, artifact_type, data):
+    _write_artifact_bytes(
+        registry, project_id, run_id, artifact_type, _canonical_bytes(data)
     )
 
 
@@ -162,7 +186,10 @@ def _stage3_stub(project_config, run_id, registry):
                 "manifest_id": f"manifest-{pid}-{run_id[:8]}",
                 "shotlist_ref": f"shotlist-{pid}-{run_id[:8]}",
                 "character_packs": _CHAR_PACKS}
-    _write_artifact_json(registry, pid, run_id, "AssetManifest_draft", manifest)
+    # Canonical on disk, so _stage5_lineage_stub can hash the file bytes as-is
+    _write_artifact_bytes(
+        registry, pid, run_id, "AssetManifest_draft", _canonical_bytes(manifest)
+    )
     return manifest
 
 
@@ -172,19 +199,25 @@ def _stage4_stub(project_config, run_id, registry):
             "plan_id": f"plan-{pid}-{run_id[:8]}",
             "manifest_ref": f"manifest-{pid}-{run_id[:8]}",
             "timing_lock_hash": _TIMING_LOCK, "fps": 24}
-    _write_artifact_json(registry, pid, run_id, "RenderPlan", plan)
+    _write_artifact_bytes(registry, pid, run_id, "RenderPlan", _canonical_bytes(plan))
     return plan
 
 
-def _stage5_stub(project_config, run_id, registry):
+def _stage5_lineage_stub(project_config, run_id, registry):
+    """RenderOutput whose lineage hashes cover the run-specific stage 3/4 output.
+
+    Unlike the conftest stage 5 stubs, this one derives its hashes from the
+    run, which is what the derived-hash normalization has to undo.
+    """
     pid = project_config["id"]
     run_dir = registry.run_dir(pid, run_id)
-    # Load what stage3/4 wrote so we can compute raw hashes as the real renderer would
+    # Hash what stage3/4 wrote (already canonical bytes), as the real renderer would
     try:
-        manifest = json.loads((run_dir / "AssetManifest_draft.json").read_text(encoding="utf-8"))
-        plan = json.loads((run_dir / "RenderPlan.json").read_text(encoding="utf-8"))
-        raw = _raw_render_hashes(manifest, plan)
-    except (OSError, json.JSONDecodeError):
+        raw = _raw_render_hashes(
+            (run_dir / "AssetManifest_draft.json").read_bytes(),
+            (run_dir / "RenderPlan.json").read_bytes(),
+        )
+    except OSError:
         raw = {"asset_manifest_hash": "?", "render_plan_hash": "?", "inputs_digest": "?"}
     data = {"schema_id": "RenderOutput", "schema_version": "1.0.0",
             "output_id": f"ro-{run_id[:8]}",
@@ -198,31 +231,14 @@ def _stage5_stub(project_config, run_id, registry):
     return data
 
 
-_STAGE_PATCH_TARGETS = [
-    ("orchestrator.stages.stage1_generate_script.run", _stage1_stub),
-    ("orchestrator.stages.stage2_script_to_shotlist.run", _stage2_stub),
-    ("orchestrator.stages.stage3_shotlist_to_assetmanifest.run", _stage3_stub),
-    ("orchestrator.stages.stage4_build_renderplan.run", _stage4_stub),
-    ("orchestrator.stages.stage5_render_preview.run", _stage5_stub),
-]
-
-
-def _patched_stages(overrides=None):
-    stubs = dict(_STAGE_PATCH_TARGETS)
-    if overrides:
-        stubs.update(overrides)
-
-    class _Ctx:
-        def __enter__(self):
-            self._stack = ExitStack()
-            for target, fn in stubs.items():
-                self._stack.enter_context(patch(target, new=fn))
-            return self
-
-        def __exit__(self, *args):
-            return self._stack.__exit__(*args)
-
-    return _Ctx()
+# Overrides for every stage of the shared patched_stages fixture (conftest.py)
+_STAGE_STUBS = {
+    stage1_generate_script: _stage1_stub,
+    stage2_script_to_shotlist: _stage2_stub,
+    stage3_shotlist_to_assetmanifest: _stage3_stub,
+    stage4_build_renderplan: _stage4_stub,
+    stage5_render_preview: _stage5_lineage_stub,
+}
 
 
 # ---------------------------------------------------------------------------
@@ -241,8 +257,8 @@ class TestDerivedHashNormalization:
 
         # Sanity check: raw hashes in RenderOutput MUST actually differ so
         # the test is meaningful (the verifier really needs to normalize them).
-        ro_a = json.loads((dir_a / "RenderOutput.json").read_text())
-        ro_b = json.loads((dir_b / "RenderOutput.json").read_text())
+        ro_a = json.loads((dir_a / "RenderOutput.json").read_bytes())
+        ro_b = json.loads((dir_b / "RenderOutput.json").read_bytes())
         assert ro_a["inputs_digest"] != ro_b["inputs_digest"], (
             "Test setup error: raw hashes should differ between runs A and B"
         )
@@ -274,17 +290,17 @@ class TestDerivedHashNormalization:
             f"Expected normalized_input_mismatch diagnostic entry, got: {diffs}"
         )
 
-    def test_determinism_report_is_deterministic_with_hash_stubs(self, tmp_path):
+    def test_determinism_report_is_deterministic_with_hash_stubs(
+        self, tmp_path, project_file, patched_stages
+    ):
         """Two invocations of investigate-determinism using stubs that embed
         run_id in IDs and lineage hashes → both DeterminismReport.json files
         must be byte-identical."""
-        project_file = tmp_path / "project.json"
-        project_file.write_text(json.dumps(_PROJECT), encoding="utf-8")
         out1 = tmp_path / "out1"
         out2 = tmp_path / "out2"
 
         runner = CliRunner()
-        with _patched_stages():
+        with patched_stages(_STAGE_STUBS):
             r1 = runner.invoke(cli, [
                 "investigate-determinism",
                 "--project", str(project_file),
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import argparse
 import json
+import subprocess
 import sys
 from pathlib import Path
 
@@ -16,25 +18,44 @@ from orchestrator.cli import cli
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_fake_agent(tmp_path: Path, *, fail: bool = False) -> str:
-    """Write a tiny Python script to tmp_path and return the --writing-agent-cmd string."""
-    script = tmp_path / "fake_writer.py"
-    if fail:
-        script.write_text("import sys; sys.exit(1)\n", encoding="utf-8")
-    else:
-        script.write_text(
-            "import sys, json, pathlib, argparse\n"
-            "p = argparse.ArgumentParser()\n"
-            "p.add_argument('--prompt'); p.add_argument('--out')\n"
-            "args = p.parse_args()\n"
-            "data = {'schema_id': 'Script', 'schema_version': '1.0.0',\n"
-            "        'script_id': 'script-test-00000001', 'title': 'Test'}\n"
-            "pathlib.Path(args.out).write_text(json.dumps(data, indent=2), encoding='utf-8')\n",
-            encoding="utf-8",
-        )
+_SCRIPT = {
+    "schema_id": "Script",
+    "schema_version": "1.0.0",
+    "script_id": "script-test-00000001",
+    "title": "Test",
+}
+_FAKE_AGENT_FAIL = "import sys; sys.exit(1)\n"
+
+def _fake_agent_run(cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run stand-in for the writing agent: writes Script.json in-process."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prompt")
+    parser.add_argument("--out")
+    args = parser.parse_args(cmd[1:])
+    Path(args.out).write_text(json.dumps(_SCRIPT, indent=2), encoding="utf-8")
+    return subprocess.CompletedProcess(cmd, 0, b"", b"")
+
+
+def _make_fake_agent(directory: Path, source: str) -> str:
+    """Write a tiny Python script to *directory* and return the --writing-agent-cmd string."""
+    script = directory / "fake_writer.py"
+    script.write_text(source, encoding="utf-8")
     return f"{sys.executable} {script}"
 
 
+@pytest.fixture
+def fake_agent_ok(monkeypatch) -> str:
+    """Agent that writes a fixed Script.json, run in-process (no interpreter start-up)."""
+    monkeypatch.setattr("orchestrator.cli.subprocess.run", _fake_agent_run)
+    return "fake-writer"
+
+
+@pytest.fixture(scope="session")
+def fake_agent_fail(tmp_path_factory) -> str:
+    """Real agent process that exits 1 without writing anything."""
+    return _make_fake_agent(tmp_path_factory.mktemp("agent_fail"), _FAKE_AGENT_FAIL)
+
+
 def _make_prompt(tmp_path: Path) -> Path:
     """Write a minimal StoryPrompt.json and return its path."""
     prompt_path = tmp_path / "StoryPrompt.json"
@@ -49,54 +70,44 @@ def _make_prompt(tmp_path: Path) -> Path:
 # T1 — success path
 # ---------------------------------------------------------------------------
 
-def test_write_success(tmp_path: Path) -> None:
+def test_write_success(tmp_path: Path, fake_agent_ok: str, cli_runner: CliRunner) -> None:
     """orchestrator write exits 0 and produces the expected Script.json."""
-    runner = CliRunner()
     prompt_path = _make_prompt(tmp_path)
     out_path = tmp_path / "Script.json"
-    agent_cmd = _make_fake_agent(tmp_path)
 
-    result = runner.invoke(
+    result = cli_runner.invoke(
         cli,
         [
             "write",
             "--prompt", str(prompt_path),
             "--out", str(out_path),
-            "--writing-agent-cmd", agent_cmd,
+            "--writing-agent-cmd", fake_agent_ok,
         ],
     )
 
     assert result.exit_code == 0, f"Expected exit 0, got {result.exit_code}. Output: {result.output}"
     assert out_path.exists(), "Script.json was not created"
 
-    expected = {
-        "schema_id": "Script",
-        "schema_version": "1.0.0",
-        "script_id": "script-test-00000001",
-        "title": "Test",
-    }
     actual = json.loads(out_path.read_text(encoding="utf-8"))
-    assert actual == expected, f"Script.json content mismatch: {actual}"
+    assert actual == _SCRIPT, f"Script.json content mismatch: {actual}"
 
 
 # ---------------------------------------------------------------------------
 # T2 — agent error
 # ---------------------------------------------------------------------------
 
-def test_write_agent_error(tmp_path: Path) -> None:
+def test_write_agent_error(tmp_path: Path, fake_agent_fail: str, cli_runner: CliRunner) -> None:
     """orchestrator write exits non-zero and prints ERROR when agent fails."""
-    runner = CliRunner()
     prompt_path = _make_prompt(tmp_path)
     out_path = tmp_path / "Script.json"
-    agent_cmd = _make_fake_agent(tmp_path, fail=True)
 
-    result = runner.invoke(
+    result = cli_runner.invoke(
         cli,
         [
             "write",
             "--prompt", str(prompt_path),
             "--out", str(out_path),
-            "--writing-agent-cmd", agent_cmd,
+            "--writing-agent-cmd", fake_agent_fail,
         ],
     )
 
@@ -108,25 +119,23 @@ def test_write_agent_error(tmp_path: Path) -> None:
 # T3 — byte-identical on re-run
 # ---------------------------------------------------------------------------
 
-def test_write_byte_identical_on_rerun(tmp_path: Path) -> None:
+def test_write_byte_identical_on_rerun(tmp_path: Path, fake_agent_ok: str, cli_runner: CliRunner) -> None:
     """Running orchestrator write twice with the same prompt produces identical output bytes."""
-    runner = CliRunner()
     prompt_path = _make_prompt(tmp_path)
     out_path = tmp_path / "Script.json"
-    agent_cmd = _make_fake_agent(tmp_path)
 
     common_args = [
         "write",
         "--prompt", str(prompt_path),
         "--out", str(out_path),
-        "--writing-agent-cmd", agent_cmd,
+        "--writing-agent-cmd", fake_agent_ok,
     ]
 
-    result1 = runner.invoke(cli, common_args)
+    result1 = cli_runner.invoke(cli, common_args)
     assert result1.exit_code == 0, f"First run failed: {result1.output}"
     bytes1 = out_path.read_bytes()
 
-    result2 = runner.invoke(cli, common_args)
+    result2 = cli_runner.invoke(cli, common_args)
     assert result2.exit_code == 0, f"Second run failed: {result2.output}"
     bytes2 = out_path.read_bytes()
 